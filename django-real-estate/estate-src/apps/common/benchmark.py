@@ -0,0 +1,153 @@
+import itertools
+import json
+import math
+import platform
+import statistics
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+import django
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+
+def percentile(values, pct):
+    # Nearest-rank percentile on an already sorted list.
+    if not values:
+        return None
+    rank = max(math.ceil(pct / 100 * len(values)) - 1, 0)
+    return values[rank]
+
+
+def summarize(latencies, queries, status_codes, elapsed):
+    latencies = sorted(latencies)
+    count = len(latencies)
+    return {
+        'requests': count,
+        'errors': sum(n for status, n in status_codes.items() if status >= 400),
+        'status_codes': {str(status): n for status, n in sorted(status_codes.items())},
+        'throughput_rps': round(count / elapsed, 2) if elapsed else None,
+        'latency_ms': {
+            'mean': round(statistics.fmean(latencies) * 1000, 3) if count else None,
+            'p50': round(percentile(latencies, 50) * 1000, 3) if count else None,
+            'p95': round(percentile(latencies, 95) * 1000, 3) if count else None,
+            'p99': round(percentile(latencies, 99) * 1000, 3) if count else None,
+            'max': round(latencies[-1] * 1000, 3) if count else None,
+        },
+        'queries_per_request': {
+            'mean': round(statistics.fmean(queries), 2) if queries else None,
+            'max': max(queries) if queries else None,
+        },
+    }
+
+
+def run_load(make_request, requests, concurrency):
+    """
+    Call ``make_request(client_index, request_index)`` ``requests`` times
+    from ``concurrency`` threads, each with its own DB connection, timing
+    every call and counting the queries it ran. ``make_request`` returns
+    the response.
+    """
+    counter = itertools.count()
+    lock = threading.Lock()
+    latencies, queries, status_codes = [], [], Counter()
+
+    def worker(client_index):
+        local_latencies, local_queries, local_codes = [], [], Counter()
+        while True:
+            with lock:
+                request_index = next(counter)
+            if request_index >= requests:
+                break
+            with CaptureQueriesContext(connection) as captured:
+                started = time.perf_counter()
+                response = make_request(client_index, request_index)
+                local_latencies.append(time.perf_counter() - started)
+            local_queries.append(len(captured))
+            local_codes[response.status_code] += 1
+        with lock:
+            latencies.extend(local_latencies)
+            queries.extend(local_queries)
+            status_codes.update(local_codes)
+
+    def threaded_worker(client_index):
+        try:
+            worker(client_index)
+        finally:
+            connection.close()
+
+    started = time.perf_counter()
+    if concurrency == 1:
+        # Stay on the calling thread (and its connection/transaction).
+        worker(0)
+    else:
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            list(executor.map(threaded_worker, range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    return summarize(latencies, queries, status_codes, elapsed)
+
+
+def time_call(func, repeat=5, number=1):
+    """
+    Best-of-``repeat`` wall time, in seconds, of ``number`` calls to ``func``.
+    For micro-benchmarks that don't go through the request cycle.
+    """
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(number):
+            func()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def environment():
+    return {
+        'timestamp': timezone.now().isoformat(),
+        'python': platform.python_version(),
+        'django': django.get_version(),
+        'database': connection.vendor,
+        'machine': platform.machine(),
+    }
+
+
+def save_results(results, path):
+    with open(path, 'w', encoding='utf-8') as output:
+        json.dump(results, output, indent=2, sort_keys=True)
+
+
+def load_results(path):
+    with open(path, encoding='utf-8') as results:
+        return json.load(results)
+
+
+def compare(baseline, current, tolerance=0.10):
+    """
+    Per-scenario relative change of throughput, p95 latency and queries per
+    request. A change worse than ``tolerance`` is flagged as a regression.
+    """
+    report = {}
+    for name, result in current['scenarios'].items():
+        before = baseline.get('scenarios', {}).get(name)
+        if not before:
+            continue
+        changes = {
+            'throughput_rps': (before['throughput_rps'], result['throughput_rps'], True),
+            'p95_ms': (before['latency_ms']['p95'], result['latency_ms']['p95'], False),
+            'queries_per_request': (
+                before['queries_per_request']['mean'], result['queries_per_request']['mean'], False,
+            ),
+        }
+        report[name] = {}
+        for metric, (old, new, higher_is_better) in changes.items():
+            if not old or new is None:
+                change = None
+            else:
+                change = (new - old) / old
+            regressed = change is not None and (-change if higher_is_better else change) > tolerance
+            report[name][metric] = {'before': old, 'after': new, 'change': change, 'regression': regressed}
+    return report
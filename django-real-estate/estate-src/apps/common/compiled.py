@@ -0,0 +1,165 @@
+import copy
+from functools import lru_cache
+
+from django.core.exceptions import FieldDoesNotExist, ObjectDoesNotExist
+from rest_framework import serializers
+from rest_framework.fields import SkipField
+from rest_framework.relations import PKOnlyObject, RelatedField
+
+# Generated function, source and field plan per serializer class.
+_compiled = {}
+
+
+class Fallback(Exception):
+    # Raised by generated code for a None relation mid-chain, which DRF
+    # resolves per field (default, allow_null, SkipField, ...).
+    pass
+
+
+@lru_cache(maxsize=None)
+def _attribute_chain(model, attrs):
+    """
+    True if every attribute in ``attrs`` is a plain model field or
+    relation accessor, i.e. safe to read with a dotted attribute access
+    instead of DRF's get_attribute() (which also calls callables).
+    """
+    for index, attr in enumerate(attrs):
+        if model is None or not attr.isidentifier():
+            return False
+        try:
+            field = model._meta.get_field(attr)
+        except FieldDoesNotExist:
+            return False
+        accessor = field.get_accessor_name() if field.auto_created and not field.concrete else field.name
+        if accessor != attr:
+            return False
+        last = index == len(attrs) - 1
+        if field.is_relation != (not last):
+            return False
+        model = field.related_model
+    return True
+
+
+def _conversion(field):
+    # Fields whose to_representation() is a plain type conversion get it
+    # inlined; the rest are called.
+    representation = type(field).to_representation
+    if representation is serializers.CharField.to_representation:
+        return 'str(v)'
+    if isinstance(field, serializers.UUIDField) and field.uuid_format == 'hex_verbose':
+        return 'str(v)'
+    if representation is serializers.IntegerField.to_representation:
+        return 'int(v)'
+    return None
+
+
+def _plan(serializer):
+    model = getattr(getattr(serializer, 'Meta', None), 'model', None)
+    plan = []
+    for field in serializer._readable_fields:
+        if isinstance(field, serializers.SerializerMethodField):
+            plan.append(('method', field, None, None))
+        elif field.source != '*' and _attribute_chain(model, tuple(field.source_attrs)):
+            plan.append(('attribute', field, tuple(field.source_attrs), _conversion(field)))
+        else:
+            plan.append(('generic', field, None, None))
+    return plan
+
+
+def _generate(plan):
+    lines = ['def represent(instance, bound):']
+    owners = {(): 'instance'}
+    items = []
+    for index, (kind, field, chain, conversion) in enumerate(plan):
+        key = repr(field.field_name)
+        if kind == 'method':
+            items.append(f'{key}: bound[{index}](instance)')
+            continue
+        if kind == 'generic':
+            value = f'(v := bound[{index}][0](instance))'
+            if isinstance(field, RelatedField):
+                value = f'({value}.pk if isinstance(v, PKOnlyObject) else v)'
+            items.append(f'{key}: None if {value} is None else bound[{index}][1](v)')
+            continue
+        # Shared relation prefixes (instance.profile) are read once.
+        for depth in range(1, len(chain)):
+            prefix = chain[:depth]
+            if prefix not in owners:
+                owners[prefix] = f'o{len(owners)}'
+                lines.append(f'    {owners[prefix]} = {owners[prefix[:-1]]}.{prefix[-1]}')
+                lines.append(f'    if {owners[prefix]} is None: raise Fallback')
+        access = f'{owners[chain[:-1]]}.{chain[-1]}'
+        converted = conversion or f'bound[{index}](v)'
+        items.append(f'{key}: None if (v := {access}) is None else {converted}')
+    lines.append('    return {' + ', '.join(items) + '}')
+    return '\n'.join(lines)
+
+
+def _compiled_for(cls):
+    if cls not in _compiled:
+        # Fields are built once per class, on a context-free prototype;
+        # building them is most of the cost of a single-object render
+        # (CountryField alone copies ~250 translated choices).
+        plan = _plan(cls())
+        namespace = {'PKOnlyObject': PKOnlyObject, 'Fallback': Fallback}
+        source = _generate(plan)
+        exec(compile(source, f'<compiled {cls.__qualname__}>', 'exec'), namespace)
+        _compiled[cls] = namespace['represent'], source, plan
+    return _compiled[cls]
+
+
+def compile_representation(serializer):
+    """
+    Return a ``represent(instance)`` function equivalent to
+    ``Serializer.to_representation`` for this serializer's readable fields,
+    as one generated function: attribute chains become dotted lookups,
+    simple conversions are inlined and method fields are called directly.
+    The function is generated once per serializer class, so the class'
+    fields must not depend on the context; the returned callable is bound
+    to this serializer (and so to its context).
+    """
+    represent, _, plan = _compiled_for(type(serializer))
+    bound = []
+    for kind, field, _, conversion in plan:
+        if kind == 'method':
+            bound.append(getattr(serializer, field.method_name))
+        elif kind == 'generic':
+            field = serializer.fields[field.field_name]
+            bound.append((field.get_attribute, field.to_representation))
+        elif conversion:
+            bound.append(None)
+        else:
+            # A shallow copy re-parented to this serializer sees its context.
+            field = copy.copy(field)
+            field.parent = serializer
+            bound.append(field.to_representation)
+    bound = tuple(bound)
+    return lambda instance: represent(instance, bound)
+
+
+def compiled_source(serializer_class):
+    # For debugging: the generated source, once the class has been used.
+    entry = _compiled.get(serializer_class)
+    return entry[1] if entry else None
+
+
+class CompiledSerializerMixin:
+    """
+    Serializer mode that renders through compile_representation() instead
+    of DRF's per-field loop. The cases DRF resolves per field (a missing or
+    None related object, a SkipField) fall back to the regular DRF path;
+    any other error is raised, as DRF would. Set
+    ``compiled_representation = False`` to switch it off.
+    """
+    compiled_representation = True
+
+    def to_representation(self, instance):
+        if not self.compiled_representation:
+            return super().to_representation(instance)
+        represent = self.__dict__.get('_represent')
+        if represent is None:
+            represent = self._represent = compile_representation(self)
+        try:
+            return represent(instance)
+        except (ObjectDoesNotExist, SkipField, Fallback):
+            return super().to_representation(instance)
@@ -0,0 +1,79 @@
+import hashlib
+from calendar import timegm
+
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+
+def make_etag(*parts):
+    digest = hashlib.md5(':'.join(str(part) for part in parts).encode(), usedforsecurity=False)
+    return quote_etag(digest.hexdigest())
+
+
+def latest(values):
+    values = [value for value in values if value is not None]
+    return max(values) if values else None
+
+
+def object_last_modified(queryset, fields, **lookup):
+    # Timestamp columns only, the row itself is never loaded.
+    row = queryset.filter(**lookup).values_list(*fields).first()
+    return latest(row) if row else None
+
+
+def list_version(queryset, fields):
+    # max(updated_at) catches edits and inserts, count catches deletes.
+    aggregates = {f'max_{index}': Max(field) for index, field in enumerate(fields)}
+    summary = queryset.order_by().aggregate(count=Count('pk'), **aggregates)
+    return latest(summary[f'max_{index}'] for index in range(len(fields))), summary['count']
+
+
+class ConditionalGetMixin:
+    """
+    Answers GET/HEAD with 304 Not Modified from the ``validator_fields``
+    timestamps alone, before the queryset is evaluated or anything is
+    serialized. Views whose serializer renders joined rows list their
+    ``updated_at`` there too.
+
+    Lists only get an ETag: a delete lowers the row count but never
+    raises max(updated_at), so Last-Modified can't tell it apart.
+    """
+    validator_fields = ('updated_at',)
+
+    def get_validators(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        model = queryset.model._meta.label_lower
+        renderer = getattr(request, 'accepted_renderer', None)
+        media_type = getattr(renderer, 'format', '')
+        # Views may render a different shape per user (e.g. staff vs public).
+        shape = self.get_serializer_class().__name__
+
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        if lookup_url_kwarg in kwargs:
+            last_modified = object_last_modified(
+                queryset, self.validator_fields, **{self.lookup_field: kwargs[lookup_url_kwarg]}
+            )
+            if last_modified is None:
+                return None, None
+            etag = make_etag(model, kwargs[lookup_url_kwarg], last_modified.isoformat(), shape, media_type)
+        else:
+            last_modified, count = list_version(queryset, self.validator_fields)
+            etag = make_etag(model, 'list', count, last_modified and last_modified.isoformat(), shape, media_type)
+            last_modified = None
+
+        return etag, last_modified
+
+    def get(self, request, *args, **kwargs):
+        etag, last_modified = self.get_validators(request, *args, **kwargs)
+        timestamp = timegm(last_modified.utctimetuple()) if last_modified else None
+
+        response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+        if response is None:
+            response = super().get(request, *args, **kwargs)
+
+        if etag and not response.has_header('ETag'):
+            response.headers['ETag'] = etag
+        if timestamp and not response.has_header('Last-Modified'):
+            response.headers['Last-Modified'] = http_date(timestamp)
+        return response
@@ -0,0 +1,101 @@
+"""
+JSON encoding/decoding for the API, through orjson when it is installed
+and a reused stdlib encoder otherwise. Both produce the output DRF's own
+JSONRenderer would, compact and UTF-8; the one difference is that orjson
+writes NaN/infinite floats as null where the stdlib path raises.
+"""
+import datetime
+import decimal
+import json
+import uuid
+
+from django.utils.functional import Promise
+from django_countries.fields import Country
+from phonenumber_field.phonenumber import PhoneNumber
+from rest_framework.utils.encoders import JSONEncoder as DRFJSONEncoder
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def encode_datetime(value):
+    representation = value.isoformat()
+    if representation.endswith('+00:00'):
+        representation = representation[:-6] + 'Z'
+    return representation
+
+
+def encode_time(value):
+    if value.utcoffset() is not None:
+        raise ValueError('JSON can\'t represent timezone-aware times.')
+    return value.isoformat()
+
+
+# Exact-type handlers, looked up before the generic isinstance() chain.
+# orjson encodes UUIDs and datetimes itself and never asks for them.
+HANDLERS = {
+    uuid.UUID: str,
+    datetime.datetime: encode_datetime,
+    datetime.date: datetime.date.isoformat,
+    datetime.time: encode_time,
+    decimal.Decimal: float,
+    PhoneNumber: str,
+    Country: lambda country: country.code,
+}
+
+_fallback = DRFJSONEncoder()
+
+
+def default(value):
+    handler = HANDLERS.get(type(value))
+    if handler is not None:
+        return handler(value)
+    if isinstance(value, (Promise, PhoneNumber)):
+        return str(value)
+    # Querysets, timedeltas, generators, ...: as DRF encodes them.
+    return _fallback.default(value)
+
+
+_encoder = json.JSONEncoder(ensure_ascii=False, allow_nan=False, separators=(',', ':'), default=default)
+
+
+def stdlib_dumps(data):
+    output = _encoder.encode(data)
+    return output.replace('\u2028', '\\u2028').replace('\u2029', '\\u2029').encode('utf-8')
+
+
+def _reject_constant(name):
+    raise ValueError(f'Out of range float values are not JSON compliant: {name}')
+
+
+def stdlib_loads(content):
+    return json.loads(content, parse_constant=_reject_constant)
+
+
+if orjson is not None:
+    _OPTIONS = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+    # DRF escapes U+2028/U+2029 so the output is also valid JavaScript.
+    _LINE_SEPARATORS = ((b'\xe2\x80\xa8', b'\\u2028'), (b'\xe2\x80\xa9', b'\\u2029'))
+
+    def _escape_separators(output):
+        for raw, escaped in _LINE_SEPARATORS:
+            if raw in output:
+                output = output.replace(raw, escaped)
+        return output
+
+    def orjson_dumps(data):
+        try:
+            return _escape_separators(orjson.dumps(data, default=default, option=_OPTIONS))
+        except orjson.JSONEncodeError:
+            # Integers over 64 bits and the like: the stdlib either encodes
+            # them or raises the error DRF would.
+            return stdlib_dumps(data)
+
+    BACKEND = 'orjson'
+    # orjson.JSONDecodeError is a ValueError, like the stdlib's.
+    dumps, loads = orjson_dumps, orjson.loads
+else:
+    BACKEND = 'json'
+    dumps, loads = stdlib_dumps, stdlib_loads
@@ -0,0 +1,106 @@
+import random
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+from django.urls import reverse
+from rest_framework_simplejwt.tokens import AccessToken
+
+from apps.common.benchmark import compare, environment, load_results, run_load, save_results
+from apps.profiles.models import Profile
+
+User = get_user_model()
+
+SCENARIOS = ['jwt_create', 'users_me', 'agent_ratings', 'rating_list']
+
+class Command(BaseCommand):
+    help = (
+        'Drive the auth, users/me and ratings endpoints in-process with concurrent clients and report '
+        'throughput, latency percentiles and queries per request. Run seed_data first.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scenarios', nargs='+', choices=SCENARIOS, default=SCENARIOS)
+        parser.add_argument('--requests', type=int, default=500, help='Requests per scenario.')
+        parser.add_argument('--concurrency', type=int, default=8)
+        parser.add_argument('--password', default='benchmark-pass', help='Password of the seeded users.')
+        parser.add_argument('--users', type=int, default=200, help='Number of distinct users to log in as.')
+        parser.add_argument('--output', help='Write the results as JSON to this path.')
+        parser.add_argument('--compare', help='Earlier results JSON to compare against.')
+        parser.add_argument('--tolerance', type=float, default=0.10, help='Relative change flagged as a regression.')
+        parser.add_argument('--seed', type=int)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        users = list(User.objects.filter(is_active=True).order_by('?')[:options['users']])
+        agents = list(Profile.objects.filter(is_agent=True).values_list('id', flat=True)[:1000])
+        if not users or not agents:
+            raise CommandError('No users or agents to benchmark with; run seed_data first.')
+
+        # Tokens are minted up front so only jwt_create pays for password hashing.
+        tokens = [f'JWT {AccessToken.for_user(user)}' for user in users]
+        host = next((host for host in settings.ALLOWED_HOSTS if host and host != '*'), 'localhost').lstrip('.')
+        # Server errors are counted in the results rather than raised.
+        clients = [Client(raise_request_exception=False, HTTP_HOST=host) for _ in range(options['concurrency'])]
+
+        def jwt_create(client_index, request_index):
+            user = users[request_index % len(users)]
+            # Spread over client addresses like real traffic, so the per-IP
+            # auth throttle doesn't turn the run into a 429 benchmark.
+            return clients[client_index].post(
+                reverse('jwt-create'),
+                {'email': user.email, 'password': options['password']},
+                content_type='application/json',
+                REMOTE_ADDR=f'10.{request_index // 65536 % 256}.{request_index // 256 % 256}.{request_index % 256}',
+            )
+
+        def users_me(client_index, request_index):
+            return clients[client_index].get(
+                reverse('user-me'), HTTP_AUTHORIZATION=tokens[request_index % len(tokens)]
+            )
+
+        def agent_ratings(client_index, request_index):
+            return clients[client_index].get(
+                reverse('agent-ratings', args=[rng.choice(agents)]),
+                HTTP_AUTHORIZATION=tokens[request_index % len(tokens)],
+            )
+
+        def rating_list(client_index, request_index):
+            return clients[client_index].get(
+                reverse('all-ratings'), HTTP_AUTHORIZATION=tokens[request_index % len(tokens)]
+            )
+
+        scenarios = {
+            'jwt_create': jwt_create,
+            'users_me': users_me,
+            'agent_ratings': agent_ratings,
+            'rating_list': rating_list,
+        }
+        results = {
+            'environment': environment(),
+            'config': {'requests': options['requests'], 'concurrency': options['concurrency']},
+            'scenarios': {},
+        }
+        for name in options['scenarios']:
+            result = run_load(scenarios[name], options['requests'], options['concurrency'])
+            results['scenarios'][name] = result
+            latency = result['latency_ms']
+            self.stdout.write(
+                f"{name:<14} {result['throughput_rps']:>9} req/s  p50 {latency['p50']:>8} ms  "
+                f"p95 {latency['p95']:>8} ms  p99 {latency['p99']:>8} ms  "
+                f"{result['queries_per_request']['mean']:>6} queries/req  {result['errors']} errors"
+            )
+
+        if options['output']:
+            save_results(results, options['output'])
+            self.stdout.write(f"Results written to {options['output']}")
+
+        if options['compare']:
+            report = compare(load_results(options['compare']), results, options['tolerance'])
+            for name, metrics in report.items():
+                for metric, change in metrics.items():
+                    if change['change'] is None:
+                        continue
+                    line = f"{name:<14} {metric:<20} {change['before']} -> {change['after']} ({change['change']:+.1%})"
+                    self.stdout.write(self.style.ERROR(line) if change['regression'] else line)
@@ -0,0 +1,93 @@
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.renderers import JSONRenderer
+
+from apps.common import jsonlib
+from apps.common.benchmark import environment, save_results, time_call
+from apps.profiles.models import Profile
+from apps.profiles.serializers import ProfileSerializer
+from apps.ratings.models import Rating
+from apps.ratings.serializers import RatingSerializer
+
+class Command(BaseCommand):
+    help = (
+        'Time JSON encoding and decoding of profile and rating payloads with DRF\'s JSONRenderer, the '
+        'stdlib path and orjson (when installed). Run seed_data first.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=1000)
+        parser.add_argument('--repeat', type=int, default=5)
+        parser.add_argument('--output', help='Write the results as JSON to this path.')
+
+    def get_payloads(self, limit):
+        profiles = list(Profile.objects.select_related('user').order_by('pkid')[:limit])
+        ratings = list(Rating.objects.select_related('rater', 'agent__user').order_by('pkid')[:limit])
+        if not profiles or not ratings:
+            raise CommandError('No profiles or ratings to encode; run seed_data first.')
+        return {
+            # What the API views render: serializer output, mostly strings.
+            'profiles': ProfileSerializer(profiles, many=True).data,
+            'ratings': RatingSerializer(ratings, many=True).data,
+            # Model values as-is, exercising the UUID/datetime/Decimal/
+            # PhoneNumber/Country handlers.
+            'profiles_typed': [
+                {
+                    'id': profile.id,
+                    'updated_at': profile.updated_at,
+                    'phone_number': profile.phone_number,
+                    'country': profile.country,
+                    'city': profile.city,
+                    'rating': profile.rating,
+                    'num_reviews': profile.num_reviews,
+                }
+                for profile in profiles
+            ],
+        }
+
+    def get_encoders(self):
+        renderer = JSONRenderer()
+        encoders = {'drf': renderer.render, 'stdlib': jsonlib.stdlib_dumps}
+        if jsonlib.orjson is not None:
+            encoders['orjson'] = jsonlib.orjson_dumps
+        return encoders
+
+    def get_decoders(self):
+        decoders = {'stdlib': jsonlib.stdlib_loads}
+        if jsonlib.orjson is not None:
+            decoders['orjson'] = jsonlib.orjson.loads
+        return decoders
+
+    def handle(self, *args, **options):
+        repeat = options['repeat']
+        results = {
+            'environment': dict(environment(), json_backend=jsonlib.BACKEND),
+            'config': {'rows': options['rows']},
+            'benchmarks': {},
+        }
+        for name, payload in self.get_payloads(options['rows']).items():
+            results['benchmarks'][name] = {}
+            body = jsonlib.stdlib_dumps(payload)
+            for encoder_name, encode in self.get_encoders().items():
+                try:
+                    elapsed = time_call(lambda: encode(payload), repeat=repeat)
+                except TypeError:
+                    # DRF's encoder has no PhoneNumber/Country support.
+                    result = None
+                else:
+                    result = {'ms': round(elapsed * 1000, 3), 'mb_per_s': round(len(body) / elapsed / 2 ** 20, 1)}
+                results['benchmarks'][name][f'encode_{encoder_name}'] = result
+                self.stdout.write(
+                    f"{name:<15} encode {encoder_name:<7} "
+                    + (f"{result['ms']:>9} ms  {result['mb_per_s']:>7} MB/s" if result else 'unsupported')
+                )
+            for decoder_name, decode in self.get_decoders().items():
+                elapsed = time_call(lambda: decode(body), repeat=repeat)
+                result = {'ms': round(elapsed * 1000, 3), 'mb_per_s': round(len(body) / elapsed / 2 ** 20, 1)}
+                results['benchmarks'][name][f'decode_{decoder_name}'] = result
+                self.stdout.write(
+                    f"{name:<15} decode {decoder_name:<7} {result['ms']:>9} ms  {result['mb_per_s']:>7} MB/s"
+                )
+
+        if options['output']:
+            save_results(results, options['output'])
+            self.stdout.write(f"Results written to {options['output']}")
@@ -0,0 +1,69 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client, override_settings
+from django.urls import reverse
+from rest_framework_simplejwt.tokens import AccessToken
+
+from apps.common.benchmark import environment, run_load, save_results
+
+User = get_user_model()
+
+DISPATCH_MIDDLEWARE = 'apps.common.middleware.PathDispatchMiddleware'
+
+
+def inline_middleware():
+    # The stack before path dispatch: FULL_STACK_MIDDLEWARE inlined for every path.
+    middleware = []
+    for path in settings.MIDDLEWARE:
+        middleware.extend(settings.FULL_STACK_MIDDLEWARE if path == DISPATCH_MIDDLEWARE else [path])
+    return middleware
+
+class Command(BaseCommand):
+    help = (
+        'Compare per-request latency of API calls through the lean, path-dispatched middleware stack '
+        'and through the full session/CSRF/auth/messages stack. Run seed_data first.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=2000, help='Requests per scenario and stack.')
+        parser.add_argument('--output', help='Write the results as JSON to this path.')
+
+    def handle(self, *args, **options):
+        user = User.objects.filter(is_active=True).order_by('pkid').first()
+        if user is None:
+            raise CommandError('No users to benchmark with; run seed_data first.')
+        token = f'JWT {AccessToken.for_user(user)}'
+        host = next((host for host in settings.ALLOWED_HOSTS if host and host != '*'), 'localhost').lstrip('.')
+        # Browsers that also use the admin send its cookies to the API too.
+        cookies = {'sessionid': 'x' * 32, 'csrftoken': 'y' * 32}
+
+        scenarios = {
+            'agent_facets': lambda client: client.get(reverse('agent-facets')),
+            'users_me': lambda client: client.get(reverse('user-me'), HTTP_AUTHORIZATION=token),
+        }
+        stacks = {'full': inline_middleware(), 'lean': list(settings.MIDDLEWARE)}
+
+        results = {'environment': environment(), 'config': {'requests': options['requests']}, 'scenarios': {}}
+        for name, scenario in scenarios.items():
+            results['scenarios'][name] = {}
+            for stack, middleware in stacks.items():
+                with override_settings(MIDDLEWARE=middleware):
+                    client = Client(raise_request_exception=False, HTTP_HOST=host)
+                    client.cookies.load(cookies)
+                    scenario(client)  # Builds the middleware chain.
+                    result = run_load(lambda client_index, request_index: scenario(client), options['requests'], 1)
+                results['scenarios'][name][stack] = result
+                latency = result['latency_ms']
+                self.stdout.write(
+                    f"{name:<13} {stack:<5} mean {latency['mean']:>7} ms  p50 {latency['p50']:>7} ms  "
+                    f"p95 {latency['p95']:>7} ms  {result['queries_per_request']['mean']:>5} queries/req  "
+                    f"{result['errors']} errors"
+                )
+            full, lean = (results['scenarios'][name][stack]['latency_ms']['mean'] for stack in stacks)
+            results['scenarios'][name]['saved_ms_per_request'] = round(full - lean, 3)
+            self.stdout.write(f"{name:<13} saved {full - lean:.3f} ms/request ({(full - lean) / full:.1%})")
+
+        if options['output']:
+            save_results(results, options['output'])
+            self.stdout.write(f"Results written to {options['output']}")
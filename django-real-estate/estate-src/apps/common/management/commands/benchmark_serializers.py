@@ -0,0 +1,112 @@
+import gc
+import tracemalloc
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.common.benchmark import environment, save_results, time_call
+from apps.ratings.models import Rating
+from apps.ratings.rows import RatingRowSerializer, rating_rows
+from apps.ratings.serializers import RatingSerializer
+from apps.users.rows import UserRowSerializer, user_rows
+from apps.users.serializers import DRFUserSerializer, UserSerializer
+
+User = get_user_model()
+
+class Command(BaseCommand):
+    help = (
+        'Compare the ModelSerializer list path with the compiled and values_list() row paths: peak memory '
+        'per 10k rows and throughput of fetch+serialize and of serialization alone, plus single-object '
+        'UserSerializer rendering. Run seed_data first.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=10000)
+        parser.add_argument('--repeat', type=int, default=3)
+        parser.add_argument('--single', type=int, default=1000, help='Single-object renders per timing.')
+        parser.add_argument('--output', help='Write the results as JSON to this path.')
+
+    def get_paths(self, limit):
+        users = User.objects.order_by('pkid')[:limit]
+        ratings = Rating.objects.order_by('pkid')[:limit]
+        return {
+            'users': {
+                'model_serializer': (
+                    lambda: list(users.select_related('profile')),
+                    lambda objects: DRFUserSerializer(objects, many=True).data,
+                ),
+                'compiled_serializer': (
+                    lambda: list(users.select_related('profile')),
+                    lambda objects: UserSerializer(objects, many=True).data,
+                ),
+                'row_serializer': (
+                    lambda: user_rows(users),
+                    lambda rows: UserRowSerializer(rows, many=True).data,
+                ),
+            },
+            'ratings': {
+                'model_serializer': (
+                    lambda: list(ratings.select_related('rater', 'agent__user')),
+                    lambda objects: RatingSerializer(objects, many=True).data,
+                ),
+                'row_serializer': (
+                    lambda: rating_rows(ratings),
+                    lambda rows: RatingRowSerializer(rows, many=True).data,
+                ),
+            },
+        }
+
+    def measure(self, fetch, serialize, repeat):
+        gc.collect()
+        tracemalloc.start()
+        objects = fetch()
+        loaded, _ = tracemalloc.get_traced_memory()
+        serialize(objects)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        count = len(objects)
+        end_to_end = time_call(lambda: serialize(fetch()), repeat=repeat)
+        serialize_only = time_call(lambda: serialize(objects), repeat=repeat)
+        per_10k = 10000 / count
+        return {
+            'rows': count,
+            'loaded_mb_per_10k': round(loaded * per_10k / 2 ** 20, 2),
+            'peak_mb_per_10k': round(peak * per_10k / 2 ** 20, 2),
+            'fetch_and_serialize_rows_per_s': round(count / end_to_end),
+            'serialize_rows_per_s': round(count / serialize_only),
+        }
+
+    def measure_single(self, number, repeat):
+        # users/me style: a fresh serializer per object, as in a detail view.
+        user = User.objects.select_related('profile').order_by('pkid').first()
+        results = {}
+        paths = [('model_serializer', DRFUserSerializer), ('compiled_serializer', UserSerializer)]
+        for path, serializer_class in paths:
+            elapsed = time_call(lambda: serializer_class(user).data, repeat=repeat, number=number)
+            results[path] = {'renders': number, 'us_per_render': round(elapsed / number * 10 ** 6, 2)}
+        return results
+
+    def handle(self, *args, **options):
+        results = {'environment': environment(), 'config': {'rows': options['rows']}, 'benchmarks': {}}
+        for name, paths in self.get_paths(options['rows']).items():
+            results['benchmarks'][name] = {}
+            for path, (fetch, serialize) in paths.items():
+                if not fetch():
+                    raise CommandError(f'No {name} to serialize; run seed_data first.')
+                result = self.measure(fetch, serialize, options['repeat'])
+                results['benchmarks'][name][path] = result
+                self.stdout.write(
+                    f"{name:<8} {path:<19} {result['rows']:>6} rows  "
+                    f"{result['loaded_mb_per_10k']:>7} MB loaded/10k  {result['peak_mb_per_10k']:>7} MB peak/10k  "
+                    f"{result['fetch_and_serialize_rows_per_s']:>8} rows/s end-to-end  "
+                    f"{result['serialize_rows_per_s']:>8} rows/s serialize"
+                )
+
+        results['benchmarks']['user_single'] = self.measure_single(options['single'], options['repeat'])
+        for path, result in results['benchmarks']['user_single'].items():
+            self.stdout.write(f"{'user':<8} {path:<19} {result['us_per_render']:>8} us/render (single object)")
+
+        if options['output']:
+            save_results(results, options['output'])
+            self.stdout.write(f"Results written to {options['output']}")
@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.common.export import EXPORT_CONTENT_TYPES, parse_since
+from apps.profiles.exports import USER_PROFILE_EXPORT
+from apps.ratings.exports import RATING_EXPORT
+
+EXPORTS = {export.name: export for export in (USER_PROFILE_EXPORT, RATING_EXPORT)}
+
+class Command(BaseCommand):
+    help = 'Stream users+profiles or ratings to CSV/NDJSON with constant memory.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('export', choices=sorted(EXPORTS))
+        parser.add_argument('--format', dest='export_format', choices=sorted(EXPORT_CONTENT_TYPES), default='csv')
+        parser.add_argument(
+            '--since', help='Only rows with updated_at at or after this ISO 8601 datetime, with a UTC offset.'
+        )
+        parser.add_argument('--output', help='File to write to (default: stdout).')
+
+    def handle(self, *args, **options):
+        since = options['since']
+        if since is not None:
+            try:
+                since = parse_since(since)
+            except ValueError as exc:
+                raise CommandError(f'--since: {exc}')
+
+        chunks = EXPORTS[options['export']].stream(options['export_format'], since)
+        if options['output']:
+            with open(options['output'], 'w', newline='', encoding='utf-8') as output:
+                output.writelines(chunks)
+        else:
+            for chunk in chunks:
+                self.stdout.write(chunk, ending='')
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from apps.common.sync import prune_tombstones
+
+class Command(BaseCommand):
+    help = (
+        'Delete sync tombstones older than SYNC_TOMBSTONE_DAYS. Clients whose cursor is older than that '
+        'get a 410 and start over with a full sync. Run it daily from cron.'
+    )
+
+    def handle(self, *args, **options):
+        deleted = prune_tombstones()
+        self.stdout.write(self.style.SUCCESS(f'{deleted} tombstone(s) pruned.'))
@@ -0,0 +1,169 @@
+import random
+import uuid
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Avg, Count
+
+from apps.profiles.facets import reconcile
+from apps.profiles.models import Gender, Profile
+from apps.ratings.models import Rating
+
+User = get_user_model()
+
+SAMPLE_IMAGES_DIR = settings.BASE_DIR / 'sample_images'
+
+FIRST_NAMES = [
+    'Ana', 'Bruno', 'Camila', 'Diego', 'Eduarda', 'Felipe', 'Gabriela', 'Henrique', 'Isabela', 'João',
+    'Larissa', 'Lucas', 'Mariana', 'Mateus', 'Natália', 'Pedro', 'Rafaela', 'Rodrigo', 'Sofia', 'Thiago',
+]
+LAST_NAMES = [
+    'Almeida', 'Barbosa', 'Carvalho', 'Costa', 'Ferreira', 'Gomes', 'Lima', 'Martins', 'Oliveira', 'Pereira',
+    'Ribeiro', 'Rodrigues', 'Santos', 'Silva', 'Souza',
+]
+LOCATIONS = [
+    ('BR', 'São Paulo'), ('BR', 'São Paulo'), ('BR', 'São Paulo'), ('BR', 'Rio de Janeiro'),
+    ('BR', 'Rio de Janeiro'), ('BR', 'Belo Horizonte'), ('BR', 'Curitiba'), ('BR', 'Porto Alegre'),
+    ('BR', 'Ribeirão Preto'), ('PT', 'Lisboa'), ('PT', 'Porto'), ('US', 'Miami'), ('AR', 'Buenos Aires'),
+]
+ABOUT_ME = [
+    'Say something about yourself',
+    'Looking for a quiet apartment close to the metro.',
+    'Family of four, searching for a house with a backyard.',
+    'Selling my studio downtown, fully furnished.',
+    'Licensed agent with ten years in residential sales.',
+    'Specialised in commercial buildings and office space.',
+]
+COMMENTS = [
+    'Very responsive and knew the neighbourhood well.',
+    'Helped us close quickly, great negotiation.',
+    'Took a while to answer messages.',
+    'Showed us exactly what we asked for.',
+    'Not great, several visits were cancelled last minute.',
+    'Excellent service from the first visit to the keys.',
+]
+# Skewed towards good reviews, like real rating distributions.
+RATING_WEIGHTS = [1, 2, 4, 8, 10]
+
+class Command(BaseCommand):
+    help = 'Bulk-generate realistic users, profiles and ratings for development and load tests.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1000)
+        parser.add_argument('--agent-ratio', type=float, default=0.2, help='Fraction of users that are agents.')
+        parser.add_argument('--ratings', type=int, default=5000)
+        parser.add_argument('--password', default='benchmark-pass', help='Password given to every seeded user.')
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--seed', type=int, help='Random seed, for reproducible data sets.')
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        batch_size = options['batch_size']
+        num_users = options['users']
+        num_agents = int(num_users * options['agent_ratio'])
+        if num_users < 2 or num_agents < 1:
+            raise CommandError('Need at least two users and one agent.')
+
+        max_ratings = num_agents * (num_users - 1) // 2
+        num_ratings = min(options['ratings'], max_ratings)
+        photos = self.copy_sample_images()
+
+        with transaction.atomic():
+            # bulk_create skips post_save, so profiles are created here
+            # instead of by apps.profiles.signals. Hashing once keeps seeding
+            # from spending minutes in PBKDF2.
+            password = make_password(options['password'])
+            run = uuid.uuid4().hex[:6]
+            users = User.objects.bulk_create(
+                [self.make_user(rng, run, i, password) for i in range(num_users)], batch_size=batch_size
+            )
+            profiles = Profile.objects.bulk_create(
+                [self.make_profile(rng, user, photos, is_agent=i < num_agents) for i, user in enumerate(users)],
+                batch_size=batch_size,
+            )
+            agents = profiles[:num_agents]
+
+            pairs = set()
+            while len(pairs) < num_ratings:
+                agent = rng.randrange(num_agents)
+                rater = rng.randrange(num_users)
+                if rater != agent:
+                    pairs.add((rater, agent))
+            Rating.objects.bulk_create(
+                [
+                    Rating(
+                        rater=users[rater],
+                        agent=agents[agent],
+                        rating=rng.choices(Rating.Range.values, RATING_WEIGHTS)[0],
+                        comment=rng.choice(COMMENTS),
+                    )
+                    for rater, agent in pairs
+                ],
+                batch_size=batch_size,
+            )
+            self.update_agent_ratings(agents, batch_size)
+            # bulk_create bypassed the signals that maintain the facet counters.
+            reconcile()
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Seeded {num_users} users ({num_agents} agents) and {num_ratings} ratings; '
+            f'password: {options["password"]}'
+        ))
+
+    def copy_sample_images(self):
+        photos = []
+        for path in sorted(SAMPLE_IMAGES_DIR.iterdir()):
+            if not default_storage.exists(path.name):
+                with path.open('rb') as image:
+                    default_storage.save(path.name, File(image))
+            photos.append(path.name)
+        return photos
+
+    def make_user(self, rng, run, i, password):
+        first_name = rng.choice(FIRST_NAMES)
+        last_name = rng.choice(LAST_NAMES)
+        username = f'{first_name}.{last_name}.{run}{i}'.lower()
+        return User(
+            username=username,
+            first_name=first_name,
+            last_name=last_name,
+            email=f'{username}@example.com',
+            password=password,
+        )
+
+    def make_profile(self, rng, user, photos, is_agent):
+        country, city = rng.choice(LOCATIONS)
+        return Profile(
+            user=user,
+            phone_number=f'+55119{rng.randrange(10 ** 8):08d}',
+            about_me=rng.choice(ABOUT_ME),
+            license=f'CRECI-{rng.randrange(10 ** 6):06d}' if is_agent else None,
+            profile_photo=rng.choice(photos),
+            gender=rng.choice(Gender.values),
+            country=country,
+            city=city,
+            is_buyer=not is_agent and rng.random() < 0.6,
+            is_seller=not is_agent and rng.random() < 0.3,
+            is_agent=is_agent,
+        )
+
+    def update_agent_ratings(self, agents, batch_size):
+        # bulk_create hands out consecutive pkids, a range avoids a huge IN list.
+        summary = {
+            row['agent']: row
+            for row in Rating.objects.filter(agent__pkid__range=(agents[0].pkid, agents[-1].pkid))
+            .values('agent')
+            .annotate(average=Avg('rating'), count=Count('pkid'))
+        }
+        for agent in agents:
+            row = summary.get(agent.pkid)
+            if row:
+                agent.rating = round(row['average'], 2)
+                agent.num_reviews = row['count']
+                agent.top_agent = row['count'] >= 5 and row['average'] >= 4.5
+        Profile.objects.bulk_update(agents, ['rating', 'num_reviews', 'top_agent'], batch_size=batch_size)
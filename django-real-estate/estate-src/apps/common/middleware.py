@@ -0,0 +1,107 @@
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.core.handlers.exception import convert_exception_to_response
+from django.utils.module_loading import import_string
+
+from .routers import end_request, has_written, start_request
+
+REPLICA_PIN_COOKIE = 'replica_pin'
+REPLICA_PIN_SALT = 'apps.common.replica_pin'
+
+
+class ReplicaPinMiddleware:
+    """
+    Read-your-writes for the replica router: a client that wrote gets a
+    short-lived signed cookie, and while it is valid all its reads go to
+    the primary, so it never reads a replica that hasn't caught up yet.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.pin_seconds = settings.REPLICA_PIN_SECONDS
+
+    def __call__(self, request):
+        pinned = request.get_signed_cookie(
+            REPLICA_PIN_COOKIE, default=None, salt=REPLICA_PIN_SALT, max_age=self.pin_seconds
+        ) is not None
+        token = start_request(pinned)
+        try:
+            response = self.get_response(request)
+            wrote = has_written()
+        finally:
+            end_request(token)
+
+        if wrote:
+            response.set_signed_cookie(
+                REPLICA_PIN_COOKIE, '1', salt=REPLICA_PIN_SALT, max_age=self.pin_seconds,
+                httponly=True, samesite='Lax',
+            )
+        return response
+
+
+class PathDispatchMiddleware:
+    """
+    Runs the ``FULL_STACK_MIDDLEWARE`` chain (sessions, CSRF, auth,
+    messages) for every request except those under
+    ``LEAN_MIDDLEWARE_PATHS``, which go straight on. The JWT API never uses
+    a session, a CSRF token or request.user, so it skips that work while
+    the admin keeps the full stack.
+
+    The inner middleware's process_view/process_exception/
+    process_template_response hooks run at this middleware's position, as
+    if they were listed inline in ``MIDDLEWARE``.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.lean_paths = tuple(settings.LEAN_MIDDLEWARE_PATHS)
+        self.view_hooks, self.template_hooks, self.exception_hooks = [], [], []
+
+        # Built the way BaseHandler.load_middleware() builds MIDDLEWARE.
+        handler = get_response
+        for middleware_path in reversed(settings.FULL_STACK_MIDDLEWARE):
+            try:
+                middleware = import_string(middleware_path)(handler)
+            except MiddlewareNotUsed:
+                continue
+            if hasattr(middleware, 'process_view'):
+                self.view_hooks.insert(0, middleware.process_view)
+            if hasattr(middleware, 'process_template_response'):
+                self.template_hooks.append(middleware.process_template_response)
+            if hasattr(middleware, 'process_exception'):
+                self.exception_hooks.append(middleware.process_exception)
+            handler = convert_exception_to_response(middleware)
+        self.full_stack = handler
+
+    def is_lean(self, request):
+        return request.path_info.startswith(self.lean_paths)
+
+    def __call__(self, request):
+        if self.is_lean(request):
+            return self.get_response(request)
+        return self.full_stack(request)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if self.is_lean(request):
+            return None
+        for hook in self.view_hooks:
+            response = hook(request, view_func, view_args, view_kwargs)
+            if response is not None:
+                return response
+        return None
+
+    def process_template_response(self, request, response):
+        if self.is_lean(request):
+            return response
+        for hook in self.template_hooks:
+            response = hook(request, response)
+        return response
+
+    def process_exception(self, request, exception):
+        if self.is_lean(request):
+            return None
+        for hook in self.exception_hooks:
+            response = hook(request, exception)
+            if response is not None:
+                return response
+        return None
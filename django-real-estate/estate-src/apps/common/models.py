@@ -10,3 +10,21 @@ class TimeStampedUUIDModel(models.Model):
     class Meta:
         abstract = True
 
+
+class Tombstone(models.Model):
+    """
+    Record of a deleted row, so delta-sync clients (apps.common.sync) learn
+    about deletions. Pruned after SYNC_TOMBSTONE_DAYS by prune_tombstones.
+    """
+    pkid = models.BigAutoField(primary_key=True, editable=False)
+    model = models.CharField(max_length=100)
+    object_id = models.UUIDField()
+    deleted_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['model', 'deleted_at', 'pkid'], name='tombstone_sync_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.model} {self.object_id} deleted at {self.deleted_at}"
@@ -0,0 +1,24 @@
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+
+from . import jsonlib
+
+class FastJSONParser(JSONParser):
+    """
+    JSONParser through apps.common.jsonlib: the body is read once and
+    decoded in one call instead of through a codecs stream reader.
+    """
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        if not self.strict:
+            return super().parse(stream, media_type, parser_context)
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        try:
+            content = stream.read()
+            if encoding.lower().replace('-', '') != 'utf8':
+                content = content.decode(encoding)
+            return jsonlib.loads(content)
+        except ValueError as exc:
+            raise ParseError('JSON parse error - %s' % str(exc))
@@ -0,0 +1,18 @@
+from rest_framework.renderers import JSONRenderer
+
+from . import jsonlib
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer through apps.common.jsonlib (orjson when installed).
+    Indented output (``?format=json; indent=4``, the browsable API) and
+    non-default UNICODE/COMPACT/STRICT_JSON settings use DRF's encoder.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        fast = self.compact and not self.ensure_ascii and self.strict
+        if not fast or self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+        return jsonlib.dumps(data)
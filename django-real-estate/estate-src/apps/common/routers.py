@@ -0,0 +1,141 @@
+import itertools
+import threading
+import time
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+class PinState:
+    __slots__ = ('pinned', 'wrote')
+
+    def __init__(self, pinned=False):
+        self.pinned = pinned
+        self.wrote = False
+
+
+# Once the current request has written, or its client wrote recently, reads
+# go to the primary. Outside a request a write pins the thread for good,
+# which is the safe default for scripts and management commands.
+_state = ContextVar('replica_state', default=None)
+
+
+def start_request(pinned=False):
+    return _state.set(PinState(pinned))
+
+
+def end_request(token):
+    _state.reset(token)
+
+
+def record_write():
+    state = _state.get()
+    if state is None:
+        state = PinState()
+        _state.set(state)
+    state.wrote = True
+
+
+def has_written():
+    state = _state.get()
+    return state is not None and state.wrote
+
+
+def is_pinned():
+    state = _state.get()
+    return state is not None and (state.pinned or state.wrote)
+
+
+class ReplicaHealth:
+    """
+    Process-wide record of which replicas are usable. A replica that fails
+    a probe is ejected for ``eject_seconds``; healthy ones are re-probed at
+    most every ``check_interval`` seconds, so routing a read is normally
+    just a dict lookup.
+    """
+
+    def __init__(self, check_interval=5, eject_seconds=30):
+        self.check_interval = check_interval
+        self.eject_seconds = eject_seconds
+        self.lock = threading.Lock()
+        self.ejected_until = {}
+        self.checked_at = {}
+
+    def is_healthy(self, alias):
+        now = time.monotonic()
+        if self.ejected_until.get(alias, 0) > now:
+            return False
+        if now - self.checked_at.get(alias, float('-inf')) < self.check_interval:
+            return True
+        self.checked_at[alias] = now
+        if self.probe(alias):
+            return True
+        self.eject(alias)
+        return False
+
+    def probe(self, alias):
+        connection = connections[alias]
+        try:
+            connection.ensure_connection()
+            return connection.is_usable()
+        except Exception:
+            # Drop the broken connection so the next probe starts fresh.
+            connection.close()
+            return False
+
+    def eject(self, alias):
+        with self.lock:
+            self.ejected_until[alias] = time.monotonic() + self.eject_seconds
+
+    def restore(self, alias):
+        with self.lock:
+            self.ejected_until.pop(alias, None)
+            self.checked_at.pop(alias, None)
+
+
+class ReplicaRouter:
+    """
+    Sends reads of the models in ``REPLICA_ROUTED_APPS`` to the aliases in
+    ``DATABASE_REPLICAS``, round-robin over the healthy ones, and everything
+    else to the primary. Reads stay on the primary while the context is
+    pinned (see ReplicaPinMiddleware) or inside a transaction.
+    """
+
+    def __init__(self, primary=None, replicas=None, apps=None, health=None):
+        self.primary = primary or DEFAULT_DB_ALIAS
+        self.replicas = list(settings.DATABASE_REPLICAS if replicas is None else replicas)
+        self.apps = set(settings.REPLICA_ROUTED_APPS if apps is None else apps)
+        self.health = health or ReplicaHealth(
+            check_interval=settings.REPLICA_HEALTH_CHECK_SECONDS,
+            eject_seconds=settings.REPLICA_EJECT_SECONDS,
+        )
+        self.cycle = itertools.cycle(self.replicas)
+        self.cycle_lock = threading.Lock()
+
+    def db_for_read(self, model, **hints):
+        if not self.replicas or model._meta.app_label not in self.apps:
+            return self.primary
+        if is_pinned() or connections[self.primary].in_atomic_block:
+            return self.primary
+        for _ in range(len(self.replicas)):
+            with self.cycle_lock:
+                alias = next(self.cycle)
+            if self.health.is_healthy(alias):
+                return alias
+        return self.primary
+
+    def db_for_write(self, model, **hints):
+        record_write()
+        return self.primary
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {self.primary, *self.replicas}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Replicas get their schema through replication.
+        if db in self.replicas:
+            return False
+        return None
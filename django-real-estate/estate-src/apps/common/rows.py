@@ -0,0 +1,61 @@
+from django.core.files.storage import default_storage
+from rest_framework import serializers
+from rest_framework.response import Response
+
+# Shared field instances, used only for their value formatting, so the
+# fast serializers render exactly what the ModelSerializers do.
+datetime_field = serializers.DateTimeField()
+
+
+def format_datetime(value):
+    return datetime_field.to_representation(value)
+
+
+def file_url(name, request=None):
+    # Same result as serializers.ImageField for a FieldFile with this name.
+    if not name:
+        return None
+    url = default_storage.url(name)
+    return request.build_absolute_uri(url) if request is not None else url
+
+
+class RowSerializer:
+    """
+    Read-only serializer for the slotted row objects built from
+    values_list() projections. Mirrors the ``Serializer(instance, many=...,
+    context=...).data`` interface so views can swap it in for a
+    ModelSerializer on list endpoints, without per-field dispatch.
+    """
+
+    def __init__(self, instance, many=False, context=None):
+        self.instance = instance
+        self.many = many
+        self.context = context or {}
+
+    def to_representation(self, row):
+        raise NotImplementedError('.to_representation() must be overridden')
+
+    @property
+    def data(self):
+        if self.many:
+            to_representation = self.to_representation
+            return [to_representation(row) for row in self.instance]
+        return self.to_representation(self.instance)
+
+
+class RowListMixin:
+    """
+    For ListAPIViews: builds the response from a values_list() projection
+    (``get_rows``) and a RowSerializer instead of model instances and the
+    view's ModelSerializer. ``serializer_class`` still describes the
+    output for detail views and schema generation.
+    """
+    row_serializer_class = None
+
+    def get_rows(self, queryset):
+        raise NotImplementedError('.get_rows() must be overridden')
+
+    def list(self, request, *args, **kwargs):
+        rows = self.get_rows(self.filter_queryset(self.get_queryset()))
+        serializer = self.row_serializer_class(rows, many=True, context=self.get_serializer_context())
+        return Response(serializer.data)
@@ -0,0 +1,140 @@
+"""
+Delta sync: "what changed since my cursor" for TimeStampedUUIDModel tables.
+
+A feed merges two streams, each read in (timestamp, pkid) order off its own
+index: the model's rows by (updated_at, pkid) as upserts, and its
+Tombstones by (deleted_at, pkid) as deletes. The cursor is the position
+reached, so a client that stores it and asks again only gets what changed
+since.
+
+Rows are only served once they are SYNC_LAG_SECONDS old: updated_at is
+set when a row is saved, not when its transaction commits, and a row
+committed after a client has moved past its updated_at would otherwise be
+missed for good. For the same reason a feed reads from the primary, never
+a replica (see routers.py): rows a lagging replica hasn't applied yet
+would fall behind the cursor.
+"""
+import base64
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import router
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from rest_framework import exceptions, status
+
+from .models import Tombstone
+
+# Stream order for changes with the same timestamp.
+UPSERT, DELETE = 0, 1
+
+
+def page_size():
+    return settings.SYNC_PAGE_SIZE
+
+
+def lag():
+    return timedelta(seconds=settings.SYNC_LAG_SECONDS)
+
+
+def tombstone_retention():
+    return timedelta(days=settings.SYNC_TOMBSTONE_DAYS)
+
+
+class CursorExpired(exceptions.APIException):
+    status_code = status.HTTP_410_GONE
+    default_detail = 'The cursor is older than the deletion history; start a full sync without a cursor.'
+    default_code = 'cursor_expired'
+
+
+def encode_cursor(timestamp, source, pkid):
+    value = f'{timestamp.isoformat()}|{source}|{pkid}'
+    return base64.urlsafe_b64encode(value.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """
+    Return ``(timestamp, source, pkid)``; raises ValueError for anything
+    that isn't a cursor issued by encode_cursor().
+    """
+    try:
+        value = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode()
+        timestamp, source, pkid = value.split('|')
+        timestamp, source, pkid = parse_datetime(timestamp), int(source), int(pkid)
+    except (UnicodeDecodeError, ValueError, TypeError):
+        raise ValueError('Invalid cursor.')
+    if timestamp is None or timestamp.tzinfo is None or source not in (UPSERT, DELETE):
+        raise ValueError('Invalid cursor.')
+    return timestamp, source, pkid
+
+
+def after(field, cursor, source):
+    # Keyset condition for "(field, source, pkid) > cursor". The plain
+    # lower bound on ``field`` is what lets the index seek straight to it.
+    timestamp, cursor_source, pkid = cursor
+    condition = Q(**{f'{field}__gte': timestamp})
+    if source > cursor_source:
+        return condition
+    if source < cursor_source:
+        return condition & Q(**{f'{field}__gt': timestamp})
+    return condition & (Q(**{f'{field}__gt': timestamp}) | Q(pkid__gt=pkid))
+
+
+class SyncFeed:
+    """
+    Changes to ``model`` in pages. ``serialize(queryset, context)`` renders
+    the upserted rows; it gets a queryset already in feed order.
+    """
+
+    def __init__(self, model, serialize):
+        self.model = model
+        self.label = model._meta.label_lower
+        self.serialize = serialize
+
+    def page(self, cursor=None, limit=None, context=None):
+        limit = limit or page_size()
+        now = timezone.now()
+        if cursor is not None and cursor[0] < now - tombstone_retention():
+            raise CursorExpired()
+
+        horizon = now - lag()
+        using = router.db_for_write(self.model)
+        upserts = self.model._default_manager.using(using).filter(updated_at__lt=horizon)
+        tombstones = Tombstone.objects.using(using).filter(model=self.label, deleted_at__lt=horizon)
+        if cursor is not None:
+            upserts = upserts.filter(after('updated_at', cursor, UPSERT))
+            tombstones = tombstones.filter(after('deleted_at', cursor, DELETE))
+
+        # Keys only, from the indexes; limit + 1 of each is enough to fill
+        # the page and know whether there is more.
+        upserts = upserts.order_by('updated_at', 'pkid').values_list('updated_at', 'pkid')
+        changes = [(updated_at, UPSERT, pkid, None) for updated_at, pkid in upserts[:limit + 1]]
+        tombstones = tombstones.order_by('deleted_at', 'pkid').values_list('deleted_at', 'pkid', 'object_id')
+        changes += [
+            (deleted_at, DELETE, pkid, object_id) for deleted_at, pkid, object_id in tombstones[:limit + 1]
+        ]
+        changes.sort(key=lambda change: change[:3])
+        has_more = len(changes) > limit
+        changes = changes[:limit]
+
+        upserted = [pkid for _, source, pkid, _ in changes if source == UPSERT]
+        rows = self.model._default_manager.using(using).filter(pkid__in=upserted).order_by('updated_at', 'pkid')
+        return {
+            'upserts': self.serialize(rows, context or {}) if upserted else [],
+            'deletes': [str(object_id) for _, source, _, object_id in changes if source == DELETE],
+            # On the last page everything before the horizon has been
+            # served, so the cursor moves up to it even without changes and
+            # an idle client's cursor doesn't age past the tombstones.
+            'cursor': encode_cursor(*changes[-1][:3]) if has_more else encode_cursor(horizon, UPSERT, 0),
+            'has_more': has_more,
+        }
+
+
+def record_tombstone(sender, instance, **kwargs):
+    # post_delete receiver for synced models.
+    Tombstone.objects.create(model=sender._meta.label_lower, object_id=instance.id)
+
+
+def prune_tombstones():
+    return Tombstone.objects.filter(deleted_at__lt=timezone.now() - tombstone_retention()).delete()[0]
@@ -1,3 +1,466 @@
-from django.test import TestCase
+import datetime
+import decimal
+import json
+import tempfile
+import uuid
+from io import BytesIO, StringIO
+from pathlib import Path
+from unittest import mock
 
-# Create your tests here.
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connections
+from django.db.models import F
+from django.http import HttpResponse
+from django.test import Client, RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.translation import gettext_lazy
+from django_countries.fields import Country
+from phonenumber_field.phonenumber import PhoneNumber
+from rest_framework.exceptions import ParseError
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from apps.profiles.models import Profile
+from apps.profiles.sync import PROFILE_FEED
+from apps.profiles.tests import create_user
+from apps.ratings.models import Rating
+from . import jsonlib
+from .benchmark import percentile
+from .middleware import REPLICA_PIN_COOKIE, PathDispatchMiddleware, ReplicaPinMiddleware
+from .parsers import FastJSONParser
+from .renderers import FastJSONRenderer
+from .sync import encode_cursor
+from .models import Tombstone
+from .routers import ReplicaHealth, ReplicaRouter, end_request, is_pinned, record_write, start_request
+from .throttles import SlidingWindowRateThrottle, get_throttle_stats
+
+class AuthThrottleTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.url = reverse('jwt-create')
+        # Pin the clock mid-window so a minute boundary can't split the test.
+        timer = mock.patch.object(SlidingWindowRateThrottle, 'timer', mock.Mock(return_value=630.0))
+        timer.start()
+        self.addCleanup(timer.stop)
+
+    def test_account_throttled_before_authentication(self):
+        payload = {'email': 'victim@example.com', 'password': 'wrong'}
+        for _ in range(5):
+            self.assertEqual(self.client.post(self.url, payload).status_code, 401)
+
+        with self.assertNumQueries(0):
+            response = self.client.post(self.url, {'email': ' Victim@example.com', 'password': 'x'})
+        self.assertEqual(response.status_code, 429)
+        self.assertIn('Retry-After', response)
+
+        # Other accounts from the same IP are still let through.
+        response = self.client.post(self.url, {'email': 'other@example.com', 'password': 'wrong'})
+        self.assertEqual(response.status_code, 401)
+
+        stats = get_throttle_stats()
+        self.assertEqual(stats['auth_account'], {'allowed': 6, 'throttled': 1})
+        self.assertEqual(stats['auth_ip']['allowed'], 7)
+
+    def test_ip_throttled_across_accounts(self):
+        for i in range(30):
+            self.client.post(self.url, {'email': f'user{i}@example.com', 'password': 'wrong'})
+        response = self.client.post(self.url, {'email': 'last@example.com', 'password': 'wrong'})
+        self.assertEqual(response.status_code, 429)
+
+    def test_ip_throttle_ignores_client_forwarded_for(self):
+        for i in range(30):
+            self.client.post(
+                self.url, {'email': f'user{i}@example.com', 'password': 'wrong'}, HTTP_X_FORWARDED_FOR=f'10.0.0.{i}'
+            )
+        response = self.client.post(
+            self.url, {'email': 'last@example.com', 'password': 'wrong'}, HTTP_X_FORWARDED_FOR='10.0.1.1'
+        )
+        self.assertEqual(response.status_code, 429)
+
+    def test_ip_throttle_behind_proxy(self):
+        # The proxy appends the address it saw; anything before it is the client's.
+        rest_framework = dict(settings.REST_FRAMEWORK, NUM_PROXIES=1)
+        with override_settings(REST_FRAMEWORK=rest_framework):
+            for i in range(30):
+                self.client.post(
+                    self.url, {'email': f'user{i}@example.com', 'password': 'wrong'},
+                    HTTP_X_FORWARDED_FOR=f'10.0.0.{i}, 203.0.113.7',
+                )
+            response = self.client.post(
+                self.url, {'email': 'last@example.com', 'password': 'wrong'},
+                HTTP_X_FORWARDED_FOR='10.0.1.1, 203.0.113.7',
+            )
+            self.assertEqual(response.status_code, 429)
+            response = self.client.post(
+                self.url, {'email': 'last@example.com', 'password': 'wrong'}, HTTP_X_FORWARDED_FOR='203.0.113.8'
+            )
+            self.assertEqual(response.status_code, 401)
+
+    def test_previous_window_is_weighted(self):
+        key = 'throttle_auth_ip_127.0.0.1'
+        # 40 requests last window, a quarter of which still overlaps: 10 > 30/min.
+        cache.set(f'{key}_9', 40)
+        with mock.patch.object(SlidingWindowRateThrottle, 'timer', mock.Mock(return_value=645.0)):
+            response = self.client.post(self.url, {'email': 'a@example.com', 'password': 'x'})
+        self.assertEqual(response.status_code, 401)
+
+        cache.set(f'{key}_9', 200)
+        with mock.patch.object(SlidingWindowRateThrottle, 'timer', mock.Mock(return_value=645.0)):
+            response = self.client.post(self.url, {'email': 'a@example.com', 'password': 'x'})
+        self.assertEqual(response.status_code, 429)
+
+    def test_stats_endpoint_requires_staff(self):
+        self.client.force_authenticate(create_user('plain'))
+        self.assertEqual(self.client.get(reverse('throttle-stats')).status_code, 403)
+
+        self.client.force_authenticate(create_user('staff', is_staff=True))
+        response = self.client.get(reverse('throttle-stats'))
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('auth_ip', response.data)
+
+class SeedAndBenchmarkTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        media = tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        self.tmp = Path(media.name)
+        media_settings = override_settings(MEDIA_ROOT=media.name)
+        media_settings.enable()
+        self.addCleanup(media_settings.disable)
+
+    def test_seed_data(self):
+        call_command('seed_data', users=20, ratings=30, seed=1, stdout=StringIO())
+        self.assertEqual(Profile.objects.count(), 20)
+        self.assertEqual(Profile.objects.filter(is_agent=True).count(), 4)
+        self.assertEqual(Rating.objects.count(), 30)
+        self.assertFalse(Rating.objects.filter(rater__profile=F('agent')).exists())
+        self.assertTrue((self.tmp / 'house_sample.jpg').exists())
+        agent = Profile.objects.filter(is_agent=True, num_reviews__gt=0).first()
+        self.assertEqual(agent.num_reviews, agent.agent_review.count())
+
+    def test_benchmark_writes_comparable_results(self):
+        call_command('seed_data', users=10, ratings=10, seed=1, stdout=StringIO())
+        output = self.tmp / 'results.json'
+        options = {'scenarios': ['users_me', 'agent_ratings'], 'requests': 5, 'concurrency': 1, 'stdout': StringIO()}
+        call_command('benchmark', output=str(output), **options)
+
+        results = json.loads(output.read_text())
+        me = results['scenarios']['users_me']
+        self.assertEqual(me['status_codes'], {'200': 5})
+        self.assertEqual(set(me['latency_ms']), {'mean', 'p50', 'p95', 'p99', 'max'})
+        self.assertGreater(me['queries_per_request']['mean'], 0)
+
+        out = StringIO()
+        call_command('benchmark', compare=str(output), **dict(options, stdout=out))
+        self.assertIn('queries_per_request', out.getvalue())
+
+    def test_percentile(self):
+        values = list(range(1, 101))
+        self.assertEqual(percentile(values, 50), 50)
+        self.assertEqual(percentile(values, 99), 99)
+        self.assertEqual(percentile([7], 95), 7)
+
+class AlwaysHealthy(ReplicaHealth):
+    def probe(self, alias):
+        return True
+
+class ReplicaRouterTests(SimpleTestCase):
+    def setUp(self):
+        self.router = ReplicaRouter(replicas=['replica_a', 'replica_b'], apps=['ratings'], health=AlwaysHealthy())
+        token = start_request()
+        self.addCleanup(end_request, token)
+
+    def test_round_robin_and_unrouted_apps(self):
+        reads = [self.router.db_for_read(Rating) for _ in range(4)]
+        self.assertEqual(reads, ['replica_a', 'replica_b', 'replica_a', 'replica_b'])
+        self.assertEqual(self.router.db_for_read(Profile), 'default')
+
+    def test_write_pins_reads_to_primary(self):
+        self.assertEqual(self.router.db_for_write(Rating), 'default')
+        self.assertEqual(self.router.db_for_read(Rating), 'default')
+
+    def test_unhealthy_replica_is_ejected(self):
+        with mock.patch.object(self.router.health, 'probe', side_effect=lambda alias: alias != 'replica_a'):
+            reads = {self.router.db_for_read(Rating) for _ in range(4)}
+        self.assertEqual(reads, {'replica_b'})
+
+        self.router.health.eject('replica_b')
+        self.assertEqual(self.router.db_for_read(Rating), 'default')
+
+    def test_pin_cookie_round_trip(self):
+        factory = RequestFactory()
+        seen = []
+
+        def write_view(request):
+            record_write()
+            return HttpResponse()
+
+        def read_view(request):
+            seen.append(is_pinned())
+            return HttpResponse()
+
+        response = ReplicaPinMiddleware(write_view)(factory.post('/'))
+        cookie = response.cookies[REPLICA_PIN_COOKIE]
+        self.assertEqual(cookie['max-age'], 10)
+
+        ReplicaPinMiddleware(read_view)(factory.get('/'))
+        request = factory.get('/')
+        request.COOKIES[REPLICA_PIN_COOKIE] = cookie.value
+        ReplicaPinMiddleware(read_view)(request)
+        self.assertEqual(seen, [False, True])
+
+class ReplicaRoutingWithSQLiteTests(SimpleTestCase):
+    """
+    Two independent SQLite files as primary and replica. Nothing replicates
+    between them, so which one a query went to is visible in its result.
+    """
+
+    aliases = ['test_primary', 'test_replica']
+
+    @classmethod
+    def setUpClass(cls):
+        # Registered here rather than via a class-level ``databases``, which
+        # the test runner would try to create from settings.DATABASES.
+        cls.databases = set(cls.aliases)
+        cls.tmp = tempfile.TemporaryDirectory()
+        configured = connections.configure_settings({
+            'default': connections.settings['default'],
+            **{
+                alias: {'ENGINE': 'django.db.backends.sqlite3', 'NAME': str(Path(cls.tmp.name) / f'{alias}.sqlite3')}
+                for alias in cls.aliases
+            },
+        })
+        for alias in cls.aliases:
+            connections.settings[alias] = configured[alias]
+        for alias in cls.aliases:
+            call_command('migrate', database=alias, verbosity=0)
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        for alias in cls.aliases:
+            connections[alias].close()
+            del connections[alias]
+            del connections.settings[alias]
+        cls.tmp.cleanup()
+
+    def setUp(self):
+        router = ReplicaRouter(
+            primary='test_primary', replicas=['test_replica'], apps=['profiles', 'ratings'], health=AlwaysHealthy()
+        )
+        routers = override_settings(DATABASE_ROUTERS=[router])
+        routers.enable()
+        self.addCleanup(routers.disable)
+
+    def test_reads_follow_writes(self):
+        token = start_request()
+        try:
+            create_user('writer')
+            # Same request: the profile created by the signal is visible.
+            self.assertEqual(Profile.objects.filter(user__username='writer').count(), 1)
+        finally:
+            end_request(token)
+
+        token = start_request()
+        try:
+            # Fresh client: served by the (stale) replica.
+            self.assertEqual(Profile.objects.count(), 0)
+        finally:
+            end_request(token)
+
+        token = start_request(pinned=True)
+        try:
+            # Client holding the pin cookie: served by the primary.
+            self.assertEqual(Profile.objects.count(), 1)
+        finally:
+            end_request(token)
+
+    @override_settings(SYNC_LAG_SECONDS=0)
+    def test_sync_feed_reads_the_primary(self):
+        create_user('syncer')
+        token = start_request()
+        try:
+            # The replica hasn't seen the profile; the feed still serves it.
+            self.assertFalse(Profile.objects.filter(user__username='syncer').exists())
+            page = PROFILE_FEED.page()
+        finally:
+            end_request(token)
+        self.assertIn('syncer', [row['username'] for row in page['upserts']])
+
+
+class FastJSONTests(SimpleTestCase):
+    payload = {
+        'id': uuid.UUID('12345678-1234-5678-1234-567812345678'),
+        'created_at': datetime.datetime(2024, 5, 1, 12, 30, 15, 120000, tzinfo=datetime.timezone.utc),
+        'day': datetime.date(2024, 5, 1),
+        'rating': decimal.Decimal('4.50'),
+        'label': gettext_lazy('Agent'),
+        'city': 'São Paulo\u2028',
+        'scores': (1, 2.5, None, True),
+        1: 'int key',
+    }
+
+    def get_dumps(self):
+        dumps = {'json': jsonlib.stdlib_dumps}
+        if jsonlib.orjson is not None:
+            dumps['orjson'] = jsonlib.orjson_dumps
+        return dumps
+
+    def test_output_matches_drf_renderer(self):
+        expected = JSONRenderer().render(self.payload)
+        for backend, dumps in self.get_dumps().items():
+            with self.subTest(backend=backend):
+                self.assertEqual(dumps(self.payload), expected)
+
+    def test_phone_number_and_country(self):
+        payload = {'phone_number': PhoneNumber.from_string('+5517991742588'), 'country': Country('BR')}
+        for backend, dumps in self.get_dumps().items():
+            with self.subTest(backend=backend):
+                self.assertEqual(json.loads(dumps(payload)), {'phone_number': '+5517991742588', 'country': 'BR'})
+
+    def test_unsupported_type_raises(self):
+        for backend, dumps in self.get_dumps().items():
+            with self.subTest(backend=backend), self.assertRaises(TypeError):
+                dumps({'value': object()})
+
+    def test_renderer_indents_through_drf(self):
+        renderer = FastJSONRenderer()
+        self.assertEqual(renderer.render({'a': 1}), b'{"a":1}')
+        self.assertEqual(renderer.render({'a': 1}, 'application/json; indent=2'), b'{\n  "a": 1\n}')
+        self.assertEqual(renderer.render(None), b'')
+
+    def test_parser(self):
+        parser = FastJSONParser()
+        body = '{"city": "São Paulo", "rating": 4.5}'.encode()
+        self.assertEqual(parser.parse(BytesIO(body)), {'city': 'São Paulo', 'rating': 4.5})
+        for invalid in [b'{"a": ', b'{"a": NaN}', b'']:
+            with self.subTest(body=invalid), self.assertRaises(ParseError):
+                parser.parse(BytesIO(invalid))
+
+
+class PathDispatchMiddlewareTests(TestCase):
+    def test_api_skips_full_stack(self):
+        seen = {}
+
+        def view(request):
+            seen[request.path] = hasattr(request, 'session'), hasattr(request, 'user')
+            return HttpResponse()
+
+        middleware = PathDispatchMiddleware(view)
+        factory = RequestFactory()
+        middleware(factory.get('/api/v1/profiles/all/'))
+        middleware(factory.get('/supersecret/'))
+        self.assertEqual(seen, {'/api/v1/profiles/all/': (False, False), '/supersecret/': (True, True)})
+
+    def test_admin_keeps_sessions_and_csrf(self):
+        create_user('boss', is_staff=True, is_superuser=True)
+        client = Client(enforce_csrf_checks=True)
+        response = client.get('/supersecret/login/')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('csrftoken', response.cookies)
+
+        credentials = {'username': 'boss@example.com', 'password': 'pass12345!'}
+        self.assertEqual(client.post('/supersecret/login/', credentials).status_code, 403)
+        credentials['csrfmiddlewaretoken'] = response.cookies['csrftoken'].value
+        response = client.post('/supersecret/login/', credentials)
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(client.get('/supersecret/').status_code, 200)
+
+    def test_api_response_sets_no_cookies(self):
+        response = Client(enforce_csrf_checks=True).get(reverse('agent-facets'))
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.cookies)
+
+
+@override_settings(SYNC_LAG_SECONDS=0)
+class DeltaSyncTests(TestCase):
+    def setUp(self):
+        self.users = [create_user(f'agent{i}') for i in range(3)]
+        self.profiles = [user.profile for user in self.users]
+        self.ratings = [
+            Rating.objects.create(rater=self.users[0], agent=self.profiles[1], rating=4, comment='ok'),
+            Rating.objects.create(rater=self.users[1], agent=self.profiles[2], rating=5, comment='great'),
+        ]
+        self.client = APIClient()
+        self.client.force_authenticate(self.users[0])
+
+    def sync(self, name, cursor=None, limit=None):
+        params = {key: value for key, value in [('cursor', cursor), ('limit', limit)] if value}
+        response = self.client.get(reverse(name), params)
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def sync_all(self, name, cursor=None, limit=1):
+        upserts, deletes = [], []
+        while True:
+            page = self.sync(name, cursor, limit)
+            upserts += [row['id'] for row in page['upserts']]
+            deletes += page['deletes']
+            cursor = page['cursor']
+            if not page['has_more']:
+                return upserts, deletes, cursor
+
+    def test_pages_cover_rows_with_equal_timestamps_once(self):
+        Profile.objects.update(updated_at=timezone.now() - datetime.timedelta(minutes=1))
+        upserts, deletes, _ = self.sync_all('profile-sync')
+        self.assertEqual(upserts, [str(profile.id) for profile in self.profiles])
+        self.assertEqual(deletes, [])
+
+    def test_changes_and_tombstones_since_cursor(self):
+        _, _, profile_cursor = self.sync_all('profile-sync', limit=10)
+        _, _, rating_cursor = self.sync_all('rating-sync', limit=10)
+        self.assertEqual(self.sync('profile-sync', profile_cursor)['upserts'], [])
+
+        self.profiles[0].city = 'Recife'
+        self.profiles[0].save()
+        self.ratings[1].delete()
+        self.users[1].delete()  # Cascades to its profile, nulls the rating's agent.
+
+        upserts, deletes, _ = self.sync_all('profile-sync', profile_cursor)
+        self.assertEqual(upserts, [str(self.profiles[0].id)])
+        self.assertEqual(deletes, [str(self.profiles[1].id)])
+
+        page = self.sync('rating-sync', rating_cursor)
+        self.assertEqual([(row['id'], row['agent']) for row in page['upserts']], [(str(self.ratings[0].id), None)])
+        self.assertEqual(page['deletes'], [str(self.ratings[1].id)])
+
+    def test_ratings_carry_profile_ids_for_renames(self):
+        Rating.objects.update(updated_at=timezone.now() - datetime.timedelta(minutes=1))
+        row = self.sync('rating-sync')['upserts'][0]
+        self.assertEqual(row['rater_profile_id'], str(self.profiles[0].id))
+        self.assertEqual(row['agent_profile_id'], str(self.profiles[1].id))
+
+        # A rename reaches clients through the profile feed, under that id.
+        _, _, cursor = self.sync_all('profile-sync', limit=10)
+        self.users[0].username = 'renamed'
+        self.users[0].save()
+        upserts = self.sync('profile-sync', cursor)['upserts']
+        self.assertEqual([(row['id'], row['username']) for row in upserts], [(row['rater_profile_id'], 'renamed')])
+
+    def test_profile_feed_hides_contact_details(self):
+        Profile.objects.update(updated_at=timezone.now() - datetime.timedelta(minutes=1))
+        rows = self.sync('profile-sync')['upserts']
+        self.assertEqual(len(rows), 3)
+        for private in ('email', 'phone_number', 'license', 'about_me'):
+            self.assertNotIn(private, rows[0])
+        self.client.force_authenticate(create_user('staff', is_staff=True))
+        self.assertIn('email', self.sync('profile-sync')['upserts'][0])
+
+    def test_bad_and_expired_cursors(self):
+        response = self.client.get(reverse('rating-sync'), {'cursor': 'nonsense'})
+        self.assertEqual(response.status_code, 400)
+        old = timezone.now() - datetime.timedelta(days=31)
+        response = self.client.get(reverse('rating-sync'), {'cursor': encode_cursor(old, 0, 0)})
+        self.assertEqual(response.status_code, 410)
+
+    def test_prune_tombstones(self):
+        self.ratings[0].delete()
+        Tombstone.objects.update(deleted_at=timezone.now() - datetime.timedelta(days=31))
+        self.ratings[1].delete()
+        call_command('prune_tombstones', stdout=StringIO())
+        self.assertEqual(list(Tombstone.objects.values_list('object_id', flat=True)), [self.ratings[1].id])
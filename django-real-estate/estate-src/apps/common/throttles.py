@@ -0,0 +1,134 @@
+import hashlib
+
+from rest_framework.throttling import SimpleRateThrottle
+
+# Views shipped by these packages are the ones mounted under api/v1/auth.
+AUTH_VIEW_PACKAGES = ('djoser', 'rest_framework_simplejwt')
+
+STATS_KEY = 'throttle_stats_%(scope)s_%(outcome)s'
+
+
+def is_auth_view(view):
+    return type(view).__module__.split('.')[0] in AUTH_VIEW_PACKAGES
+
+
+def record(cache, scope, outcome):
+    key = STATS_KEY % {'scope': scope, 'outcome': outcome}
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 1, None)
+
+
+def get_throttle_stats(scopes=None):
+    """
+    Allowed/throttled counts for each auth throttle scope, for monitoring.
+    """
+    scopes = scopes or [throttle.scope for throttle in (AuthIPRateThrottle, AuthAccountRateThrottle)]
+    keys = {
+        (scope, outcome): STATS_KEY % {'scope': scope, 'outcome': outcome}
+        for scope in scopes
+        for outcome in ('allowed', 'throttled')
+    }
+    values = SlidingWindowRateThrottle.cache.get_many(keys.values())
+    stats = {scope: {'allowed': 0, 'throttled': 0} for scope in scopes}
+    for (scope, outcome), key in keys.items():
+        stats[scope][outcome] = values.get(key, 0)
+    return stats
+
+
+class SlidingWindowRateThrottle(SimpleRateThrottle):
+    """
+    Sliding window counter: the previous fixed window's count is weighted
+    by how much of it still overlaps the sliding window and added to the
+    current one. Two integers per key instead of a timestamp list, so the
+    check is a single get_many and an incr.
+    """
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        self.now = self.timer()
+        window = int(self.now // self.duration)
+        self.elapsed = self.now - window * self.duration
+        self.current_key = f'{self.key}_{window}'
+        previous_key = f'{self.key}_{window - 1}'
+
+        counts = self.cache.get_many([self.current_key, previous_key])
+        self.current = counts.get(self.current_key, 0)
+        self.previous = counts.get(previous_key, 0)
+        overlap = (self.duration - self.elapsed) / self.duration
+
+        if self.previous * overlap + self.current >= self.num_requests:
+            return self.throttle_failure()
+        return self.throttle_success()
+
+    def throttle_success(self):
+        # Counters must outlive their own window to serve as "previous".
+        if not self.cache.add(self.current_key, 1, self.duration * 2):
+            try:
+                self.cache.incr(self.current_key)
+            except ValueError:
+                self.cache.set(self.current_key, 1, self.duration * 2)
+        record(self.cache, self.scope, 'allowed')
+        return True
+
+    def throttle_failure(self):
+        record(self.cache, self.scope, 'throttled')
+        return False
+
+    def wait(self):
+        remaining = self.duration - self.elapsed
+        if self.current >= self.num_requests or not self.previous:
+            return remaining
+        # Time until the previous window's weight has decayed enough.
+        excess = self.previous * remaining / self.duration + self.current - self.num_requests + 1
+        return max(min(excess * self.duration / self.previous, remaining), 0)
+
+
+class AuthRateThrottle(SlidingWindowRateThrottle):
+    """
+    Only throttles writes to the djoser and simplejwt views. Throttles run
+    in APIView.initial(), before the serializer hashes a password or
+    touches the database.
+    """
+
+    def get_cache_key(self, request, view):
+        if request.method in ('GET', 'HEAD', 'OPTIONS') or not is_auth_view(view):
+            return None
+        ident = self.get_auth_ident(request)
+        if not ident:
+            return None
+        return self.cache_format % {'scope': self.scope, 'ident': ident}
+
+    def get_auth_ident(self, request):
+        raise NotImplementedError('.get_auth_ident() must be overridden')
+
+
+class AuthIPRateThrottle(AuthRateThrottle):
+    scope = 'auth_ip'
+
+    def get_auth_ident(self, request):
+        return self.get_ident(request)
+
+
+class AuthAccountRateThrottle(AuthRateThrottle):
+    scope = 'auth_account'
+
+    def get_auth_ident(self, request):
+        try:
+            login = request.data.get('email')
+        except AttributeError:
+            return None
+        if not isinstance(login, str):
+            return None
+        login = login.strip().lower()
+        if not login:
+            return None
+        # Keep arbitrary user input out of cache keys.
+        return hashlib.md5(login.encode(), usedforsecurity=False).hexdigest()
@@ -0,0 +1,6 @@
+from django.urls import path
+from .views import ThrottleStatsAPIView
+
+urlpatterns = [
+    path('throttles/', ThrottleStatsAPIView.as_view(), name='throttle-stats'),
+]
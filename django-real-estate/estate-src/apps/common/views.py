@@ -1,3 +1,58 @@
-from django.shortcuts import render
+from rest_framework import permissions
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.response import Response
+from rest_framework.views import APIView
 
-# Create your views here.
+from .export import EXPORT_CONTENT_TYPES, parse_since
+from .sync import decode_cursor
+from .throttles import get_throttle_stats
+
+class ThrottleStatsAPIView(APIView):
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request):
+        return Response(get_throttle_stats())
+
+class ExportAPIView(APIView):
+    permission_classes = [permissions.IsAdminUser]
+    export = None
+
+    def perform_content_negotiation(self, request, force=False):
+        # The body is CSV/NDJSON whatever the client asked for; only error
+        # responses go through a renderer.
+        return super().perform_content_negotiation(request, force=True)
+
+    def get(self, request, export_format):
+        if export_format not in EXPORT_CONTENT_TYPES:
+            raise NotFound(f'Unknown export format: {export_format}')
+
+        since = request.query_params.get('since')
+        if since is not None:
+            try:
+                since = parse_since(since)
+            except ValueError as exc:
+                raise ValidationError({'since': str(exc)})
+
+        return self.export.response(export_format, since)
+
+class SyncAPIView(APIView):
+    """
+    ``GET ?cursor=<cursor>&limit=<n>``: the next page of ``feed``'s changes.
+    Without a cursor it starts from the beginning (a full sync).
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    feed = None
+    max_limit = 1000
+
+    def get(self, request):
+        cursor = request.query_params.get('cursor')
+        if cursor:
+            try:
+                cursor = decode_cursor(cursor)
+            except ValueError:
+                raise ValidationError({'cursor': 'Invalid cursor.'})
+        try:
+            limit = min(max(int(request.query_params.get('limit', 0)), 0), self.max_limit) or None
+        except ValueError:
+            raise ValidationError({'limit': 'Expected an integer.'})
+        return Response(self.feed.page(cursor or None, limit, {'request': request}))
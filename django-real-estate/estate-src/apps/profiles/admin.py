@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Profile
+from .models import AgentFacetCount, Profile, ProfilePhotoJob
 
 class ProfileAdmin(admin.ModelAdmin):
     list_display = ['id', 'pkid', 'user', 'gender', 'phone_number', 'country', 'city']
@@ -7,3 +7,15 @@ class ProfileAdmin(admin.ModelAdmin):
     list_display_links = ['id', 'pkid', 'user']
 
 admin.site.register(Profile, ProfileAdmin)
+
+class AgentFacetCountAdmin(admin.ModelAdmin):
+    list_display = ['facet', 'value', 'count']
+    list_filter = ['facet']
+
+admin.site.register(AgentFacetCount, AgentFacetCountAdmin)
+
+class ProfilePhotoJobAdmin(admin.ModelAdmin):
+    list_display = ['profile', 'photo', 'attempts', 'created_at']
+    readonly_fields = ['last_error']
+
+admin.site.register(ProfilePhotoJob, ProfilePhotoJobAdmin)
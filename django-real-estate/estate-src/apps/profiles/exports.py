@@ -0,0 +1,27 @@
+from apps.common.export import Export
+from .models import Profile
+
+# Profile.updated_at covers the user columns (see signals.save_user_profile).
+USER_PROFILE_EXPORT = Export('users', Profile, [
+    ('user_id', 'user__id'),
+    ('username', 'user__username'),
+    ('email', 'user__email'),
+    ('first_name', 'user__first_name'),
+    ('last_name', 'user__last_name'),
+    ('is_active', 'user__is_active'),
+    ('date_joined', 'user__date_joined'),
+    ('profile_id', 'id'),
+    ('phone_number', 'phone_number'),
+    ('license', 'license'),
+    ('gender', 'gender'),
+    ('country', 'country'),
+    ('city', 'city'),
+    ('is_buyer', 'is_buyer'),
+    ('is_seller', 'is_seller'),
+    ('is_agent', 'is_agent'),
+    ('top_agent', 'top_agent'),
+    ('rating', 'rating'),
+    ('num_reviews', 'num_reviews'),
+    ('created_at', 'created_at'),
+    ('updated_at', 'updated_at'),
+])
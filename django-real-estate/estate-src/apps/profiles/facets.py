@@ -0,0 +1,123 @@
+from collections import Counter
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F
+
+from .models import AgentFacet, AgentFacetCount, Profile
+
+# Profile fields that decide which facet rows an agent counts towards.
+FACET_FIELDS = ['is_agent', 'gender', 'country', 'city']
+
+# Each facet counts one field on its own, i.e. the agents a filter on that
+# Profile field alone would match. So the city facet is keyed by name and
+# same-named cities in different countries share a row; that is intended,
+# and the country facet gives the per-country split.
+
+
+def facet_state(values):
+    # ``values`` maps FACET_FIELDS to model attributes or raw column values.
+    country = values['country']
+    return {
+        'is_agent': values['is_agent'],
+        'gender': values['gender'],
+        'country': getattr(country, 'code', country) or '',
+        'city': values['city'],
+    }
+
+
+def stored_facet_values(profile):
+    """
+    FACET_FIELDS as stored for ``profile``, or None if it isn't saved yet.
+    Free for profiles loaded with their facet fields (see
+    Profile.loaded_values); otherwise one query.
+    """
+    if profile.pk is None:
+        return None
+    loaded = profile.loaded_values
+    if all(field in loaded for field in FACET_FIELDS):
+        return {field: loaded[field] for field in FACET_FIELDS}
+    return Profile.objects.filter(pk=profile.pk).values(*FACET_FIELDS).first()
+
+
+def facet_keys(state):
+    if not state or not state['is_agent']:
+        return []
+    return [
+        (AgentFacet.GENDER, state['gender']),
+        (AgentFacet.COUNTRY, state['country']),
+        (AgentFacet.CITY, state['city']),
+    ]
+
+
+def facet_deltas(before, after):
+    deltas = Counter(facet_keys(after))
+    deltas.subtract(facet_keys(before))
+    return {key: delta for key, delta in deltas.items() if delta}
+
+
+def apply_deltas(deltas):
+    """
+    Increment/decrement facet rows in place with F() expressions, creating
+    rows for values seen for the first time. Rows are updated in key order,
+    so concurrent saves lock them in the same order and can't deadlock.
+    """
+    for (facet, value), delta in sorted(deltas.items()):
+        updated = AgentFacetCount.objects.filter(facet=facet, value=value).update(count=F('count') + delta)
+        if updated:
+            continue
+        try:
+            with transaction.atomic():
+                AgentFacetCount.objects.create(facet=facet, value=value, count=delta)
+        except IntegrityError:
+            # Created concurrently since the update above.
+            AgentFacetCount.objects.filter(facet=facet, value=value).update(count=F('count') + delta)
+
+
+def facet_counts():
+    """
+    All non-empty facets in one read of the (facet, -count) index:
+    ``{'gender': {'Female': 12, ...}, 'country': {...}, 'city': {...}}``.
+    """
+    counts = {facet: {} for facet in AgentFacet.values}
+    rows = AgentFacetCount.objects.filter(count__gt=0).order_by('facet', '-count')
+    for facet, value, count in rows.values_list('facet', 'value', 'count'):
+        counts[facet][value] = count
+    return counts
+
+
+def reconcile():
+    """
+    Rebuild the counters from the profiles table. Returns the number of
+    rows that were off. Facet rows are locked first; Profile.save() applies
+    its deltas in the same transaction as the row, so a save racing with
+    the rebuild is either counted here or applied after it, never both.
+    """
+    with transaction.atomic():
+        current = {
+            (row.facet, row.value): row
+            for row in AgentFacetCount.objects.select_for_update()
+        }
+        agents = Profile.objects.filter(is_agent=True).order_by()
+        actual = Counter()
+        for facet in AgentFacet.values:
+            for row in agents.values(facet).annotate(total=Count('pkid')):
+                actual[(facet, str(row[facet]))] = row['total']
+
+        fixed, stale = [], []
+        for key, row in current.items():
+            count = actual.get(key, 0)
+            if row.count != count:
+                row.count = count
+                fixed.append(row)
+            if not count:
+                stale.append(row.pk)
+        AgentFacetCount.objects.bulk_update(fixed, ['count'])
+        AgentFacetCount.objects.filter(pk__in=stale).delete()
+
+        missing = [
+            AgentFacetCount(facet=facet, value=value, count=count)
+            for (facet, value), count in actual.items()
+            if (facet, value) not in current
+        ]
+        AgentFacetCount.objects.bulk_create(missing)
+    return len(fixed) + len(missing)
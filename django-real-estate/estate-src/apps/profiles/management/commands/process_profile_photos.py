@@ -0,0 +1,27 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.profiles.photos import process_pending
+
+class Command(BaseCommand):
+    help = (
+        'Downsize queued profile photos and strip their metadata. Run it as a long-lived worker '
+        'with --loop, or periodically from cron; several workers can share the queue.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', type=int, default=50, help='Jobs per batch.')
+        parser.add_argument('--max-attempts', type=int, default=3)
+        parser.add_argument('--loop', action='store_true', help='Keep polling for new jobs.')
+        parser.add_argument('--interval', type=float, default=5, help='Seconds between polls when idle.')
+
+    def handle(self, *args, **options):
+        while True:
+            processed, failed = process_pending(options['limit'], options['max_attempts'])
+            if processed or failed or not options['loop']:
+                self.stdout.write(f'{processed} photo(s) processed, {failed} failed.')
+            if not options['loop']:
+                break
+            if not processed:
+                time.sleep(options['interval'])
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from apps.profiles.facets import reconcile
+
+class Command(BaseCommand):
+    help = (
+        'Rebuild the agent facet counters from the profiles table. Run it periodically (e.g. hourly '
+        'from cron) to repair drift from bulk updates, which bypass the profile signals.'
+    )
+
+    def handle(self, *args, **options):
+        fixed = reconcile()
+        self.stdout.write(self.style.SUCCESS(f'Facet counts reconciled, {fixed} row(s) corrected.'))
@@ -0,0 +1,26 @@
+# Generated by Django 5.1.6 on 2026-10-19 14:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('profiles', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AgentFacetCount',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('facet', models.CharField(choices=[('gender', 'Gender'), ('country', 'Country'), ('city', 'City')], max_length=20, verbose_name='Facet')),
+                ('value', models.CharField(max_length=180, verbose_name='Value')),
+                ('count', models.IntegerField(default=0, verbose_name='Count')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['facet', '-count'], name='agent_facet_count_idx')],
+                'constraints': [models.UniqueConstraint(fields=('facet', 'value'), name='agent_facet_value_uniq')],
+            },
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.1.6 on 2026-10-19 14:25
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('profiles', '0002_agentfacetcount'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProfilePhotoJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('photo', models.CharField(max_length=255, verbose_name='Photo')),
+                ('attempts', models.PositiveSmallIntegerField(default=0, verbose_name='Attempts')),
+                ('last_error', models.TextField(blank=True, verbose_name='Last Error')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('profile', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='photo_job', to='profiles.profile')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['created_at'], name='profile_photo_job_created_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.1.6 on 2026-10-19 14:31
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('profiles', '0003_profilephotojob'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='profile',
+            index=models.Index(fields=['updated_at', 'pkid'], name='profile_sync_idx'),
+        ),
+    ]
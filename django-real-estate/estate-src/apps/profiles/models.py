@@ -1,4 +1,4 @@
-from django.db import models
+from django.db import models, router, transaction
 from django.contrib.auth import get_user_model
 from django.utils.translation import gettext_lazy as _
 from django_countries.fields import CountryField
@@ -29,5 +29,90 @@ class Profile(TimeStampedUUIDModel):
     rating = models.DecimalField(max_digits=4, decimal_places=2, null=True, blank=False)
     num_reviews = models.IntegerField(verbose_name=_('Nuumber of Reviews'), default=0, null=True, blank=True)
 
+    class Meta:
+        indexes = [
+            # Keyset order of the delta-sync feed (apps.common.sync).
+            models.Index(fields=['updated_at', 'pkid'], name='profile_sync_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.user.username}'s profile"
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # What is stored, so the facet signals can diff a save without a
+        # query. Kept as is; loaded_values only builds the dict on save.
+        instance._loaded_row = (field_names, values)
+        return instance
+
+    @property
+    def loaded_values(self):
+        if '_loaded_row' in self.__dict__:
+            field_names, values = self.__dict__.pop('_loaded_row')
+            self._loaded_values = dict(zip(field_names, values))
+        return self.__dict__.setdefault('_loaded_values', {})
+
+    def refresh_from_db(self, using=None, fields=None, from_queryset=None):
+        super().refresh_from_db(using=using, fields=fields, from_queryset=from_queryset)
+        self.remember_stored(fields)
+
+    def save(self, *args, **kwargs):
+        # The facet counter updates made by the signals commit with the row.
+        using = kwargs.get('using') or router.db_for_write(type(self), instance=self)
+        with transaction.atomic(using=using, savepoint=False):
+            super().save(*args, **kwargs)
+        self.remember_stored(kwargs.get('update_fields'))
+
+    def remember_stored(self, fields=None):
+        deferred = self.get_deferred_fields()
+        self.loaded_values.update(
+            (field.attname, getattr(self, field.attname))
+            for field in self._meta.concrete_fields
+            if field.attname not in deferred and (fields is None or {field.name, field.attname} & set(fields))
+        )
+
+class AgentFacet(models.TextChoices):
+    GENDER = 'gender', _('Gender')
+    COUNTRY = 'country', _('Country')
+    CITY = 'city', _('City')
+
+class AgentFacetCount(models.Model):
+    """
+    Number of agent profiles per gender, country and city, kept up to date
+    by the signals in apps.profiles.signals and rebuilt by the
+    reconcile_facets command.
+    """
+    facet = models.CharField(verbose_name=_('Facet'), choices=AgentFacet.choices, max_length=20)
+    value = models.CharField(verbose_name=_('Value'), max_length=180)
+    count = models.IntegerField(verbose_name=_('Count'), default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['facet', 'value'], name='agent_facet_value_uniq'),
+        ]
+        indexes = [
+            models.Index(fields=['facet', '-count'], name='agent_facet_count_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.facet}={self.value}: {self.count}"
+
+class ProfilePhotoJob(models.Model):
+    """
+    An uploaded profile photo waiting for the process_profile_photos
+    worker to downsize it and strip its metadata (see photos.py).
+    """
+    profile = models.OneToOneField(Profile, related_name='photo_job', on_delete=models.CASCADE)
+    photo = models.CharField(verbose_name=_('Photo'), max_length=255)
+    attempts = models.PositiveSmallIntegerField(verbose_name=_('Attempts'), default=0)
+    last_error = models.TextField(verbose_name=_('Last Error'), blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['created_at'], name='profile_photo_job_created_idx'),
+        ]
+
     def __str__(self):
-        return f"{self.user.username}'s profile"
\ No newline at end of file
+        return f"{self.photo} ({self.attempts} attempt(s))"
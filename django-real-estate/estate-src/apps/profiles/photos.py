@@ -0,0 +1,197 @@
+"""
+Profile photo upload pipeline.
+
+The request worker only streams the upload to a temporary file (capped at
+PROFILE_PHOTO_MAX_UPLOAD_SIZE), reads format and dimensions from the image
+header, and moves the file into storage. Oversized photos are queued as a
+ProfilePhotoJob; the process_profile_photos worker downsizes them and drops
+their metadata (EXIF, GPS, ...), so no full decode happens in a web worker.
+"""
+import io
+import uuid
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.files.uploadhandler import TemporaryFileUploadHandler
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+from PIL import Image, ImageOps
+from rest_framework import exceptions, status
+
+from apps.users.cards import forget_user_card
+from .models import Profile, ProfilePhotoJob
+
+PHOTO_UPLOAD_DIR = 'profile_photos'
+
+# Format reported by Pillow -> file extension.
+PHOTO_FORMATS = {'JPEG': 'jpg', 'PNG': 'png', 'WEBP': 'webp'}
+
+# Multipart framing and small form fields on top of the file itself.
+MULTIPART_OVERHEAD = 64 * 1024
+
+
+def max_upload_size():
+    return settings.PROFILE_PHOTO_MAX_UPLOAD_SIZE
+
+
+def max_pixels():
+    return settings.PROFILE_PHOTO_MAX_PIXELS
+
+
+def photo_size():
+    return settings.PROFILE_PHOTO_SIZE
+
+
+def reencode_bytes():
+    return settings.PROFILE_PHOTO_REENCODE_BYTES
+
+
+class PhotoTooLarge(exceptions.APIException):
+    status_code = status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+    default_detail = _('The photo is too large.')
+    default_code = 'photo_too_large'
+
+
+class ProfilePhotoUploadHandler(TemporaryFileUploadHandler):
+    """
+    Streams file uploads to a temporary file, never to memory, and aborts
+    with a 413 as soon as the declared request size or the bytes received
+    go over ``max_size``.
+    """
+
+    def __init__(self, request=None, max_size=None):
+        super().__init__(request)
+        self.max_size = max_size or max_upload_size()
+        self.received = 0
+
+    def handle_raw_input(self, input_data, META, content_length, boundary, encoding=None):
+        if content_length > self.max_size + MULTIPART_OVERHEAD:
+            raise PhotoTooLarge()
+
+    def receive_data_chunk(self, raw_data, start):
+        # Counted across files: one request stores at most max_size on disk.
+        self.received += len(raw_data)
+        if self.received > self.max_size:
+            self.upload_interrupted()
+            raise PhotoTooLarge()
+        return super().receive_data_chunk(raw_data, start)
+
+
+def inspect_photo(uploaded):
+    """
+    Return ``(format, width, height)`` from the image header. Image.open()
+    is lazy: it parses the header and never decodes the pixel data.
+    """
+    uploaded.seek(0)
+    try:
+        with Image.open(uploaded) as image:
+            image_format, (width, height) = image.format, image.size
+    except (OSError, SyntaxError, ValueError, Image.DecompressionBombError):
+        raise exceptions.ValidationError({'profile_photo': [_('Upload a valid JPEG, PNG or WebP image.')]})
+    finally:
+        uploaded.seek(0)
+
+    if image_format not in PHOTO_FORMATS:
+        raise exceptions.ValidationError({'profile_photo': [_('Upload a valid JPEG, PNG or WebP image.')]})
+    if width * height > max_pixels():
+        raise exceptions.ValidationError({'profile_photo': [_('The image has too many pixels.')]})
+    return image_format, width, height
+
+
+def needs_processing(size, width, height):
+    return size > reencode_bytes() or max(width, height) > photo_size()
+
+
+def photo_name(profile, extension):
+    return f'{PHOTO_UPLOAD_DIR}/{profile.id}/{uuid.uuid4().hex}.{extension}'
+
+
+def delete_photo(name):
+    # Only files this pipeline stored; never the shared default photo.
+    if name and name.startswith(f'{PHOTO_UPLOAD_DIR}/'):
+        default_storage.delete(name)
+
+
+def store_photo(profile, uploaded):
+    """
+    Validate ``uploaded`` from its header and make it ``profile``'s photo.
+    With FileSystemStorage the temporary file is moved into place, not
+    copied. Returns True if the photo was queued for re-encoding.
+    """
+    image_format, width, height = inspect_photo(uploaded)
+    previous = profile.profile_photo.name
+    profile.profile_photo.save(photo_name(profile, PHOTO_FORMATS[image_format]), uploaded, save=False)
+    deferred = needs_processing(uploaded.size, width, height)
+    with transaction.atomic():
+        profile.save(update_fields=['profile_photo', 'updated_at'])
+        if deferred:
+            ProfilePhotoJob.objects.update_or_create(
+                profile=profile, defaults={'photo': profile.profile_photo.name, 'attempts': 0, 'last_error': ''}
+            )
+        else:
+            ProfilePhotoJob.objects.filter(profile=profile).delete()
+    transaction.on_commit(lambda: delete_photo(previous))
+    return deferred
+
+
+def reencode(source, max_side):
+    """
+    Downsize to fit ``max_side`` and re-encode without metadata. For JPEG,
+    draft() decodes at a reduced DCT scale, so even a 50 MP original is
+    never fully expanded in memory.
+    """
+    with Image.open(source) as image:
+        image.draft('RGB', (max_side, max_side))
+        image = ImageOps.exif_transpose(image)
+        image.thumbnail((max_side, max_side))
+        output = io.BytesIO()
+        if image.mode in ('RGBA', 'LA', 'P'):
+            image.save(output, 'PNG', optimize=True)
+            return output.getvalue(), 'png'
+        image.convert('RGB').save(output, 'JPEG', quality=85, optimize=True, progressive=True)
+        return output.getvalue(), 'jpg'
+
+
+def process_job(job):
+    profile = job.profile
+    with default_storage.open(job.photo) as source:
+        content, extension = reencode(source, photo_size())
+    name = default_storage.save(photo_name(profile, extension), ContentFile(content))
+    # Only swap if the profile still shows this upload; a newer one wins.
+    swapped = Profile.objects.filter(pk=profile.pk, profile_photo=job.photo).update(
+        profile_photo=name, updated_at=timezone.now()
+    )
+    if swapped:
+        # update() skips the signals that drop the cached user card.
+        transaction.on_commit(lambda: forget_user_card(profile.user_id))
+        transaction.on_commit(lambda: delete_photo(job.photo))
+    else:
+        transaction.on_commit(lambda: delete_photo(name))
+    job.delete()
+
+
+def process_pending(limit=50, max_attempts=3):
+    """
+    Run up to ``limit`` queued jobs, oldest first. Each is claimed with
+    SELECT ... FOR UPDATE SKIP LOCKED, so several workers can share the
+    queue. Returns ``(processed, failed)``.
+    """
+    processed = failed = 0
+    pending = ProfilePhotoJob.objects.filter(attempts__lt=max_attempts).order_by('created_at')
+    for pk in list(pending.values_list('pk', flat=True)[:limit]):
+        try:
+            with transaction.atomic():
+                claim = pending.select_for_update(skip_locked=True, of=('self',)).select_related('profile')
+                job = claim.filter(pk=pk).first()
+                if job is None:
+                    continue
+                process_job(job)
+            processed += 1
+        except Exception as exc:
+            # The original stays in place; the job is retried up to max_attempts.
+            ProfilePhotoJob.objects.filter(pk=pk).update(attempts=F('attempts') + 1, last_error=str(exc)[:500])
+            failed += 1
+    return processed, failed
@@ -0,0 +1,61 @@
+from django_countries.serializer_fields import CountryField
+from rest_framework import serializers
+
+from .models import Profile
+
+class ProfileSerializer(serializers.ModelSerializer):
+    username = serializers.CharField(source='user.username')
+    first_name = serializers.CharField(source='user.first_name')
+    last_name = serializers.CharField(source='user.last_name')
+    email = serializers.EmailField(source='user.email')
+    full_name = serializers.SerializerMethodField(read_only=True)
+    country = CountryField(name_only=True)
+
+    class Meta:
+        model = Profile
+        fields = [
+            'id',
+            'username',
+            'first_name',
+            'last_name',
+            'full_name',
+            'email',
+            'phone_number',
+            'profile_photo',
+            'about_me',
+            'license',
+            'gender',
+            'country',
+            'city',
+            'is_buyer',
+            'is_seller',
+            'is_agent',
+            'rating',
+            'num_reviews',
+            'top_agent',
+        ]
+
+    def get_full_name(self, obj):
+        return obj.user.get_full_name
+
+class PublicProfileSerializer(ProfileSerializer):
+    # What any user may see of another: no contact details (email, phone
+    # number), license or about me.
+    class Meta(ProfileSerializer.Meta):
+        fields = [
+            'id',
+            'username',
+            'first_name',
+            'last_name',
+            'full_name',
+            'profile_photo',
+            'country',
+            'city',
+            'is_agent',
+            'rating',
+            'num_reviews',
+            'top_agent',
+        ]
+
+def profile_serializer_class(user):
+    return ProfileSerializer if user is not None and user.is_staff else PublicProfileSerializer
@@ -1,7 +1,9 @@
 import logging
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
 from django.dispatch import receiver
 from real_estate.settings.base import AUTH_USER_MODEL
+from apps.common.sync import record_tombstone
+from apps.profiles.facets import FACET_FIELDS, apply_deltas, facet_deltas, facet_state, stored_facet_values
 from apps.profiles.models import Profile
 
 logger = logging.getLogger(__name__)
@@ -13,5 +15,31 @@ def create_user_profile(sender, instance, created, **kwargs):
 
 @receiver(post_save, sender=AUTH_USER_MODEL)
 def save_user_profile(sender, instance, created, **kwargs):
+    # Every User save also saves (and so re-stamps) its Profile, which is
+    # why Profile.updated_at stands for the user columns too: the profile
+    # views' validators, exports and sync feed rely on it.
     instance.profile.save()
-    logger.info(f"{instance}'s profile created")
\ No newline at end of file
+    logger.info(f"{instance}'s profile created")
+
+@receiver([pre_save, pre_delete], sender=Profile)
+def load_facet_values(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw or (update_fields is not None and update_fields.isdisjoint(FACET_FIELDS)):
+        return
+    instance._facet_values = stored_facet_values(instance)
+
+@receiver(post_save, sender=Profile)
+def update_facet_counts(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw or (update_fields is not None and update_fields.isdisjoint(FACET_FIELDS)):
+        return
+    # Only what was written: fields left out of update_fields keep their stored value.
+    before = instance._facet_values
+    written = FACET_FIELDS if update_fields is None else [field for field in FACET_FIELDS if field in update_fields]
+    after = {**(before or {}), **{field: getattr(instance, field) for field in written}}
+    apply_deltas(facet_deltas(before and facet_state(before), facet_state(after)))
+
+@receiver(post_delete, sender=Profile)
+def remove_facet_counts(sender, instance, **kwargs):
+    before = instance._facet_values
+    apply_deltas(facet_deltas(before and facet_state(before), None))
+
+post_delete.connect(record_tombstone, sender=Profile, dispatch_uid='profile_tombstone')
@@ -0,0 +1,11 @@
+from apps.common.sync import SyncFeed
+from .models import Profile
+from .serializers import profile_serializer_class
+
+def serialize_profiles(profiles, context):
+    # Same shapes as the profile views: public fields unless staff.
+    serializer_class = profile_serializer_class(getattr(context.get('request'), 'user', None))
+    return serializer_class(profiles.select_related('user'), many=True, context=context).data
+
+# Carries user changes too (see signals.save_user_profile).
+PROFILE_FEED = SyncFeed(Profile, serialize_profiles)
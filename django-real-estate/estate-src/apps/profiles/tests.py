@@ -1,3 +1,259 @@
-from django.test import TestCase
+import json
+import shutil
+import tempfile
+import time
+from io import BytesIO, StringIO
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import CommandError, call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.http import http_date
+from PIL import Image
+from rest_framework.test import APIClient
+
+from .facets import facet_counts, reconcile
+from .models import AgentFacetCount, Profile, ProfilePhotoJob
+from .photos import process_pending
+
+User = get_user_model()
+
+def create_user(username, **extra_fields):
+    return User.objects.create_user(
+        username, 'Test', 'User', f'{username}@example.com', 'pass12345!', **extra_fields
+    )
+
+class ProfileConditionalGetTests(TestCase):
+    def setUp(self):
+        self.user = create_user('alice')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_detail_returns_304_for_matching_etag(self):
+        url = reverse('profile-details', args=[self.user.profile.id])
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('Last-Modified', response)
+
+        with self.assertNumQueries(1):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 304)
+
+    def test_list_etag_changes_on_update_and_delete(self):
+        other = create_user('bob')
+        url = reverse('all-profiles')
+        etag = self.client.get(url)['ETag']
+
+        other.first_name = 'Robert'
+        other.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+        etag = response['ETag']
+        other.delete()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data), 1)
+
+    def test_contact_details_are_staff_only(self):
+        other = create_user('bob')
+        url = reverse('profile-details', args=[other.profile.id])
+        response = self.client.get(url)
+        for private in ('email', 'phone_number', 'license', 'about_me'):
+            self.assertNotIn(private, response.data)
+            self.assertNotIn(private, self.client.get(reverse('all-profiles')).data[0])
+        self.assertEqual(response.data['username'], 'bob')
+
+        # The staff shape gets its own ETag, so a cached public body never matches.
+        self.client.force_authenticate(create_user('staff', is_staff=True))
+        staff = self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(staff.status_code, 200)
+        self.assertEqual(staff.data['email'], 'bob@example.com')
+
+    def test_list_has_no_last_modified(self):
+        # A delete never raises max(updated_at): If-Modified-Since alone
+        # would get a 304 for a list that lost a row.
+        other = create_user('bob')
+        url = reverse('all-profiles')
+        response = self.client.get(url)
+        self.assertNotIn('Last-Modified', response)
+
+        other.delete()
+        response = self.client.get(url, HTTP_IF_MODIFIED_SINCE=http_date(time.time() + 60))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data), 1)
+
+class ProfileExportTests(TestCase):
+    def setUp(self):
+        self.staff = create_user('staff', is_staff=True)
+        self.client = APIClient()
+        self.client.force_authenticate(self.staff)
+
+    def test_ndjson_export_since(self):
+        create_user('old')
+        since = timezone.now()
+        create_user('new')
+
+        response = self.client.get(reverse('profile-export', args=['ndjson']), {'since': since.isoformat()})
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        rows = [json.loads(line) for line in b''.join(response.streaming_content).splitlines()]
+        self.assertEqual([row['username'] for row in rows], ['new'])
+        self.assertEqual(rows[0]['phone_number'], '+5517991742588')
+        self.assertNotIn('password', rows[0])
+
+    def test_bad_since_and_format(self):
+        for since in ('yesterday', '2024-01-31T12:00:00', '2024-02-30T12:00:00Z'):
+            response = self.client.get(reverse('profile-export', args=['csv']), {'since': since})
+            self.assertEqual(response.status_code, 400)
+        response = self.client.get(reverse('profile-export', args=['xml']))
+        self.assertEqual(response.status_code, 404)
+
+    def test_export_command(self):
+        out = StringIO()
+        call_command('export_data', 'users', stdout=out)
+        self.assertEqual(out.getvalue().splitlines()[1].split(',')[1], 'staff')
+        with self.assertRaises(CommandError):
+            call_command('export_data', 'users', since='2024-01-31T12:00:00', stdout=out)
+
+class AgentFacetTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+
+    def make_agent(self, username, city='São Paulo', country='BR', gender='Female'):
+        profile = create_user(username).profile
+        profile.is_agent = True
+        profile.city = city
+        profile.country = country
+        profile.gender = gender
+        profile.save()
+        return profile
+
+    def test_counts_follow_profile_changes(self):
+        ana = self.make_agent('ana')
+        self.make_agent('bia', city='Lisboa', country='PT')
+        self.make_agent('caio', gender='Male')
+        create_user('buyer')
+
+        counts = self.client.get(reverse('agent-facets')).data
+        self.assertEqual(counts['city'], {'São Paulo': 2, 'Lisboa': 1})
+        self.assertEqual(counts['country'], {'BR': 2, 'PT': 1})
+        self.assertEqual(counts['gender'], {'Female': 2, 'Male': 1})
+
+        ana.city = 'Curitiba'
+        ana.save()
+        ana.user.delete()
+        Profile.objects.get(user__username='bia').user.delete()
+        self.assertEqual(facet_counts()['city'], {'São Paulo': 1})
+
+    def test_unrelated_save_skips_counters(self):
+        agent = Profile.objects.get(pk=self.make_agent('ana').pk)
+        agent.about_me = 'Changed'
+        with self.assertNumQueries(1):
+            agent.save()
+
+    def test_update_fields_only_counts_written_fields(self):
+        agent = self.make_agent('ana')
+        agent.city = 'Recife'
+        agent.about_me = 'Changed'
+        with self.assertNumQueries(1):
+            agent.save(update_fields=['about_me'])
+        self.assertEqual(facet_counts()['city'], {'São Paulo': 1})
+
+        agent.country = 'PT'
+        agent.save(update_fields=['country'])
+        self.assertEqual(facet_counts()['city'], {'São Paulo': 1})
+        self.assertEqual(facet_counts()['country'], {'PT': 1})
+        agent.save()
+        self.assertEqual(facet_counts()['city'], {'Recife': 1})
+
+    def test_deferred_facet_fields_are_read_on_save(self):
+        self.make_agent('ana')
+        agent = Profile.objects.only('pkid', 'city').get()
+        agent.city = 'Recife'
+        agent.save()
+        self.assertEqual(facet_counts()['city'], {'Recife': 1})
+        Profile.objects.only('pkid', 'id', 'user').get().delete()
+        self.assertEqual(facet_counts()['city'], {})
+
+    def test_reconcile_repairs_bulk_updates(self):
+        self.make_agent('ana')
+        Profile.objects.update(city='Recife')
+        self.assertEqual(facet_counts()['city'], {'São Paulo': 1})
+
+        self.assertEqual(reconcile(), 2)
+        self.assertEqual(facet_counts()['city'], {'Recife': 1})
+        self.assertEqual(AgentFacetCount.objects.filter(value='São Paulo').count(), 0)
+
+def image_file(name, size, image_format, exif=None):
+    output = BytesIO()
+    Image.new('RGB', size, 'teal').save(output, image_format, **({'exif': exif} if exif else {}))
+    return SimpleUploadedFile(name, output.getvalue())
+
+class ProfilePhotoUploadTests(TestCase):
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        media = override_settings(MEDIA_ROOT=media_root)
+        media.enable()
+        self.addCleanup(media.disable)
+
+        self.user = create_user('paula')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.url = reverse('profile-photo')
+
+    def upload(self, uploaded):
+        return self.client.put(self.url, {'profile_photo': uploaded}, format='multipart')
+
+    def test_small_photo_is_stored_directly(self):
+        response = self.upload(image_file('me.png', (200, 100), 'PNG'))
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.data['processing'])
+        profile = Profile.objects.get(user=self.user)
+        self.assertTrue(profile.profile_photo.name.endswith('.png'))
+        self.assertTrue(default_storage.exists(profile.profile_photo.name))
+        self.assertFalse(ProfilePhotoJob.objects.exists())
+
+    def test_oversized_photo_is_downsized_by_worker(self):
+        exif = Image.Exif()
+        exif[0x010F] = 'PhoneMaker'
+        response = self.upload(image_file('big.jpg', (2400, 1200), 'JPEG', exif=exif))
+        self.assertEqual(response.status_code, 202)
+        original = Profile.objects.get(user=self.user).profile_photo.name
+        self.assertEqual(ProfilePhotoJob.objects.get().photo, original)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(process_pending(), (1, 0))
+        photo = Profile.objects.get(user=self.user).profile_photo
+        self.assertNotEqual(photo.name, original)
+        self.assertFalse(default_storage.exists(original))
+        with Image.open(photo.path) as image:
+            self.assertEqual(image.size, (1600, 800))
+            self.assertFalse(image.getexif())
+        self.assertFalse(ProfilePhotoJob.objects.exists())
+
+    def test_replaced_photo_is_not_swapped_back(self):
+        self.upload(image_file('big.jpg', (2400, 1200), 'JPEG'))
+        job = ProfilePhotoJob.objects.get()
+        Profile.objects.filter(user=self.user).update(profile_photo='profile_photos/newer.png')
+        self.assertEqual(process_pending(), (1, 0))
+        self.assertEqual(Profile.objects.get(user=self.user).profile_photo.name, 'profile_photos/newer.png')
+        self.assertFalse(ProfilePhotoJob.objects.filter(pk=job.pk).exists())
+
+    @override_settings(PROFILE_PHOTO_MAX_UPLOAD_SIZE=100 * 1024)
+    def test_upload_over_cap_is_rejected(self):
+        # Refused from Content-Length alone, and while streaming when the
+        # declared size is within the multipart allowance.
+        for size in [400 * 1024, 150 * 1024]:
+            response = self.upload(SimpleUploadedFile('huge.jpg', b'x' * size))
+            self.assertEqual(response.status_code, 413)
+        self.assertEqual(Profile.objects.get(user=self.user).profile_photo.name, '/profile_default.png')
+
+    def test_invalid_images_are_rejected(self):
+        self.assertEqual(self.upload(SimpleUploadedFile('me.jpg', b'not an image')).status_code, 400)
+        self.assertEqual(self.upload(image_file('me.gif', (10, 10), 'GIF')).status_code, 400)
+        with override_settings(PROFILE_PHOTO_MAX_PIXELS=100):
+            self.assertEqual(self.upload(image_file('me.png', (20, 20), 'PNG')).status_code, 400)
@@ -0,0 +1,14 @@
+from django.urls import path
+from .views import (
+    AgentFacetsAPIView, ProfileDetailAPIView, ProfileExportAPIView, ProfileListAPIView, ProfilePhotoAPIView,
+    ProfileSyncAPIView,
+)
+
+urlpatterns = [
+    path('all/', ProfileListAPIView.as_view(), name='all-profiles'),
+    path('me/photo/', ProfilePhotoAPIView.as_view(), name='profile-photo'),
+    path('sync/', ProfileSyncAPIView.as_view(), name='profile-sync'),
+    path('agents/facets/', AgentFacetsAPIView.as_view(), name='agent-facets'),
+    path('<uuid:id>/', ProfileDetailAPIView.as_view(), name='profile-details'),
+    path('export/<str:export_format>/', ProfileExportAPIView.as_view(), name='profile-export'),
+]
@@ -1,3 +1,66 @@
-from django.shortcuts import render
+from rest_framework import exceptions, generics, permissions, status
+from rest_framework.parsers import MultiPartParser
+from rest_framework.response import Response
+from rest_framework.views import APIView
 
-# Create your views here.
+from apps.common.conditional import ConditionalGetMixin
+from apps.common.views import ExportAPIView, SyncAPIView
+from .exports import USER_PROFILE_EXPORT
+from .facets import facet_counts
+from .models import Profile
+from .photos import ProfilePhotoUploadHandler, store_photo
+from .serializers import profile_serializer_class
+from .sync import PROFILE_FEED
+
+class ProfileSerializerMixin:
+    # Staff get the full profile, everyone else the public fields; users
+    # read their own contact details through djoser's users/me endpoint.
+    def get_serializer_class(self):
+        return profile_serializer_class(self.request.user)
+
+class ProfileListAPIView(ProfileSerializerMixin, ConditionalGetMixin, generics.ListAPIView):
+    permission_classes = [permissions.IsAuthenticated]
+    # Profile.updated_at covers the user fields (see signals.save_user_profile).
+    queryset = Profile.objects.select_related('user').order_by('pkid')
+
+class ProfileDetailAPIView(ProfileSerializerMixin, ConditionalGetMixin, generics.RetrieveAPIView):
+    permission_classes = [permissions.IsAuthenticated]
+    queryset = Profile.objects.select_related('user')
+    lookup_field = 'id'
+
+class ProfileExportAPIView(ExportAPIView):
+    export = USER_PROFILE_EXPORT
+
+class ProfileSyncAPIView(SyncAPIView):
+    feed = PROFILE_FEED
+
+class AgentFacetsAPIView(APIView):
+    # Public: feeds the "N agents in São Paulo" filters of the directory.
+    permission_classes = [permissions.AllowAny]
+
+    def get(self, request):
+        return Response(facet_counts())
+
+class ProfilePhotoAPIView(APIView):
+    """
+    PUT a multipart ``profile_photo`` for the current user. The response is
+    202 when the photo was queued for downsizing, 200 otherwise.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    parser_classes = [MultiPartParser]
+
+    def initialize_request(self, request, *args, **kwargs):
+        # Must be set before anything reads the body.
+        request.upload_handlers = [ProfilePhotoUploadHandler(request)]
+        return super().initialize_request(request, *args, **kwargs)
+
+    def put(self, request):
+        uploaded = request.FILES.get('profile_photo')
+        if uploaded is None:
+            raise exceptions.ValidationError({'profile_photo': ['No file was submitted.']})
+        profile = request.user.profile
+        deferred = store_photo(profile, uploaded)
+        return Response(
+            {'profile_photo': request.build_absolute_uri(profile.profile_photo.url), 'processing': deferred},
+            status=status.HTTP_202_ACCEPTED if deferred else status.HTTP_200_OK,
+        )
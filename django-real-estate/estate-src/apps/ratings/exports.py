@@ -0,0 +1,14 @@
+from apps.common.export import Export
+from .models import Rating
+
+RATING_EXPORT = Export('ratings', Rating, [
+    ('id', 'id'),
+    ('rater_id', 'rater__id'),
+    ('rater', 'rater__username'),
+    ('agent_id', 'agent__id'),
+    ('agent', 'agent__user__username'),
+    ('rating', 'rating'),
+    ('comment', 'comment'),
+    ('created_at', 'created_at'),
+    ('updated_at', 'updated_at'),
+])
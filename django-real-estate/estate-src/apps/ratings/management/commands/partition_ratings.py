@@ -0,0 +1,49 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.utils import timezone
+
+from apps.ratings import partitioning
+
+class Command(BaseCommand):
+    help = (
+        'Create upcoming monthly partitions of the ratings table (PostgreSQL). '
+        'Run it from cron; with --convert it first turns the existing table into a partitioned one.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--months', type=int, default=3, help='How many months ahead to create.')
+        parser.add_argument('--convert', action='store_true', help='Convert an unpartitioned table first.')
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS)
+
+    def handle(self, *args, **options):
+        connection = connections[options['database']]
+        if not partitioning.supports_partitioning(connection):
+            self.stdout.write(
+                f'{connection.vendor} has no declarative partitioning; ratings stay in one table, '
+                'served by the rating_agent_recent_idx index.'
+            )
+            return
+
+        this_month = timezone.now().date().replace(day=1)
+        last = partitioning.add_months(this_month, options['months'])
+
+        if not partitioning.is_partitioned(connection):
+            if not options['convert']:
+                self.stdout.write(self.style.WARNING(
+                    f'{partitioning.TABLE} is not partitioned; run with --convert to convert it.'
+                ))
+                return
+            partitioning.convert_to_partitioned(connection, last)
+            self.stdout.write(self.style.SUCCESS(
+                f'Converted {partitioning.TABLE}; the old table is kept as {partitioning.UNPARTITIONED_TABLE}.'
+            ))
+
+        created, failed = partitioning.create_partitions(connection, this_month, last)
+        self.stdout.write(self.style.SUCCESS(
+            f"Created {len(created)} partition(s): {', '.join(created)}" if created else 'Partitions are up to date.'
+        ))
+        if failed:
+            # Non-zero exit, so cron reports it.
+            raise CommandError(
+                'Could not create ' + '; '.join(f'{name}: {error}' for name, error in failed.items())
+            )
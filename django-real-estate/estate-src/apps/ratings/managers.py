@@ -0,0 +1,22 @@
+from datetime import timedelta
+
+from django.db import models
+from django.utils import timezone
+
+# Window tried first for "latest reviews": wide enough to usually fill a
+# page, narrow enough that Postgres only scans the newest partitions.
+RECENT_WINDOW = timedelta(days=90)
+
+class RatingQuerySet(models.QuerySet):
+    def for_agent(self, agent):
+        return self.filter(agent=agent).order_by('-created_at')
+
+    def recent_for_agent(self, agent, limit=10, window=RECENT_WINDOW):
+        # The created_at bound lets the planner prune old partitions and walk
+        # the (agent, created_at DESC) index; agents with few recent reviews
+        # fall back to the unbounded query.
+        since = timezone.now() - window
+        recent = list(self.for_agent(agent).filter(created_at__gte=since)[:limit])
+        if len(recent) == limit:
+            return recent
+        return list(self.for_agent(agent)[:limit])
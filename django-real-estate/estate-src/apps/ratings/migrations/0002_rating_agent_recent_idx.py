@@ -0,0 +1,20 @@
+# Generated by Django 5.1.6 on 2026-10-19 14:09
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('profiles', '0001_initial'),
+        ('ratings', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='rating',
+            index=models.Index(fields=['agent', '-created_at'], name='rating_agent_recent_idx'),
+        ),
+    ]
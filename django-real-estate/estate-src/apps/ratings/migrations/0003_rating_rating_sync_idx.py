@@ -0,0 +1,20 @@
+# Generated by Django 5.1.6 on 2026-10-19 14:31
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('profiles', '0004_profile_profile_sync_idx'),
+        ('ratings', '0002_rating_agent_recent_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='rating',
+            index=models.Index(fields=['updated_at', 'pkid'], name='rating_sync_idx'),
+        ),
+    ]
@@ -3,6 +3,7 @@ from django.utils.translation import gettext_lazy as _
 from real_estate.settings.base import AUTH_USER_MODEL
 from apps.common.models import TimeStampedUUIDModel
 from apps.profiles.models import Profile
+from .managers import RatingQuerySet
 
 class Rating(TimeStampedUUIDModel):
 
@@ -39,8 +40,17 @@ class Rating(TimeStampedUUIDModel):
         verbose_name= _("Comment")
     )
 
+    objects = RatingQuerySet.as_manager()
+
     class Meta:
         unique_together = ['rater', 'agent']
+        indexes = [
+            # Latest reviews for an agent. On Postgres the partitioned table
+            # gets a covering version of this index (see partitioning.py).
+            models.Index(fields=['agent', '-created_at'], name='rating_agent_recent_idx'),
+            # Keyset order of the delta-sync feed (apps.common.sync).
+            models.Index(fields=['updated_at', 'pkid'], name='rating_sync_idx'),
+        ]
 
     def __str__(self):
         return f"{self.agent} rated at {self.rating}"
@@ -0,0 +1,225 @@
+"""
+Monthly range partitioning of ratings_rating by created_at (PostgreSQL only).
+
+Postgres requires every unique constraint of a partitioned table to include
+the partition key, so after conversion:
+
+- the primary key is (pkid, created_at) and ``id`` is unique per
+  (id, created_at); pkid still comes from one sequence and id is a uuid4,
+  so both stay unique in practice;
+- the (rater, agent) uniqueness moves to the unpartitioned
+  ratings_rating_pair table, maintained by a trigger, so a duplicate rating
+  still fails with an IntegrityError.
+
+Rows outside every monthly partition land in ratings_rating_default, so a
+missed run of ``partition_ratings`` never makes inserts fail; the next run
+moves them into the month's partition when it creates it.
+"""
+import logging
+from datetime import date, datetime, timezone
+
+from django.db import DatabaseError, transaction
+
+from .models import Rating
+
+TABLE = Rating._meta.db_table
+PARTITIONED_TABLE = f'{TABLE}_partitioned'
+UNPARTITIONED_TABLE = f'{TABLE}_unpartitioned'
+DEFAULT_PARTITION = f'{TABLE}_default'
+PAIR_TABLE = f'{TABLE}_pair'
+PAIR_TRIGGER = f'{TABLE}_pair_sync'
+
+logger = logging.getLogger(__name__)
+
+
+def supports_partitioning(connection):
+    return connection.vendor == 'postgresql'
+
+
+def partition_name(month):
+    return f'{TABLE}_p{month:%Y%m}'
+
+
+def add_months(month, months):
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def month_range(first, last):
+    month = date(first.year, first.month, 1)
+    while month <= last:
+        yield month
+        month = add_months(month, 1)
+
+
+def is_partitioned(connection):
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT c.relkind FROM pg_class c WHERE c.oid = to_regclass(%s)", [TABLE]
+        )
+        row = cursor.fetchone()
+    return row is not None and row[0] == 'p'
+
+
+def existing_partitions(connection):
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT child.relname FROM pg_inherits
+            JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+            JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+            WHERE parent.oid = to_regclass(%s)
+            """,
+            [TABLE],
+        )
+        return {name for name, in cursor.fetchall()}
+
+
+def month_bounds(month):
+    start = datetime(month.year, month.month, 1, tzinfo=timezone.utc)
+    end = datetime.combine(add_months(month, 1), datetime.min.time(), tzinfo=timezone.utc)
+    return start, end
+
+
+def create_partition(cursor, table, month):
+    cursor.execute(
+        f'CREATE TABLE IF NOT EXISTS "{partition_name(month)}" PARTITION OF "{table}" '
+        'FOR VALUES FROM (%s) TO (%s)',
+        month_bounds(month),
+    )
+
+
+def create_month_partition(cursor, month):
+    """
+    Create ``month``'s partition of the live table. Postgres refuses to
+    while the DEFAULT partition holds rows of that month, so they are
+    moved out first and re-inserted through the parent, which routes them
+    to the new partition. The pair trigger fires on both the delete and
+    the insert, so ratings_rating_pair stays in step.
+    """
+    start, end = month_bounds(month)
+    moved = f'{partition_name(month)}_moved'
+    cursor.execute(f'LOCK TABLE "{TABLE}" IN ACCESS EXCLUSIVE MODE')
+    cursor.execute(f'CREATE TEMPORARY TABLE "{moved}" (LIKE "{TABLE}") ON COMMIT DROP')
+    cursor.execute(
+        f'WITH rows AS (DELETE FROM "{DEFAULT_PARTITION}" WHERE created_at >= %s AND created_at < %s RETURNING *) '
+        f'INSERT INTO "{moved}" SELECT * FROM rows',
+        [start, end],
+    )
+    create_partition(cursor, TABLE, month)
+    cursor.execute(f'INSERT INTO "{TABLE}" SELECT * FROM "{moved}"')
+
+
+def create_partitions(connection, first, last):
+    """
+    Create the monthly partitions from ``first`` to ``last`` that don't
+    exist yet, each in its own transaction. Returns ``(created, failed)``:
+    the names of the partitions created and a {name: error} dict of the
+    ones that couldn't be, which the next run retries.
+    """
+    existing = existing_partitions(connection)
+    created, failed = [], {}
+    for month in month_range(first, last):
+        name = partition_name(month)
+        if name in existing:
+            continue
+        try:
+            with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+                create_month_partition(cursor, month)
+        except DatabaseError as exc:
+            logger.exception('Could not create partition %s', name)
+            failed[name] = str(exc)
+        else:
+            created.append(name)
+    return created, failed
+
+
+def convert_to_partitioned(connection, last):
+    """
+    Rebuild ratings_rating as a partitioned table in one transaction, with
+    monthly partitions from the oldest rating up to ``last``. The original
+    table is kept, without its foreign keys, as ratings_rating_unpartitioned
+    for the operator to drop.
+    """
+    user_table = Rating._meta.get_field('rater').related_model._meta.db_table
+    profile_table = Rating._meta.get_field('agent').related_model._meta.db_table
+
+    with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+        cursor.execute(f'LOCK TABLE "{TABLE}" IN ACCESS EXCLUSIVE MODE')
+        cursor.execute(f'SELECT min(created_at) FROM "{TABLE}"')
+        oldest = cursor.fetchone()[0]
+        first = oldest.date() if oldest else last
+
+        cursor.execute(
+            f'CREATE TABLE "{PARTITIONED_TABLE}" '
+            f'(LIKE "{TABLE}" INCLUDING DEFAULTS INCLUDING IDENTITY) PARTITION BY RANGE (created_at)'
+        )
+        cursor.execute(f'CREATE TABLE "{DEFAULT_PARTITION}" PARTITION OF "{PARTITIONED_TABLE}" DEFAULT')
+        for month in month_range(first, last):
+            create_partition(cursor, PARTITIONED_TABLE, month)
+
+        cursor.execute(f'INSERT INTO "{PARTITIONED_TABLE}" SELECT * FROM "{TABLE}"')
+        cursor.execute(f'ALTER TABLE "{TABLE}" RENAME TO "{UNPARTITIONED_TABLE}"')
+        # The kept copy must not hold on to users and profiles: Django's
+        # SET_NULL only updates the live table, so its foreign keys would
+        # make every later delete of a rater or agent fail at commit.
+        cursor.execute(
+            "SELECT conname FROM pg_constraint WHERE conrelid = to_regclass(%s) AND contype = 'f'",
+            [UNPARTITIONED_TABLE],
+        )
+        for name, in cursor.fetchall():
+            cursor.execute(f'ALTER TABLE "{UNPARTITIONED_TABLE}" DROP CONSTRAINT "{name}"')
+        cursor.execute(f'ALTER TABLE "{PARTITIONED_TABLE}" RENAME TO "{TABLE}"')
+        cursor.execute(
+            f"SELECT setval(pg_get_serial_sequence('\"{TABLE}\"', 'pkid'), "
+            f'coalesce((SELECT max(pkid) FROM "{TABLE}"), 0) + 1, false)'
+        )
+
+        # Old constraint and index names still belong to the renamed table,
+        # so the new ones get their own.
+        cursor.execute(f'ALTER TABLE "{TABLE}" ADD CONSTRAINT "{TABLE}_part_pkey" PRIMARY KEY (pkid, created_at)')
+        cursor.execute(f'ALTER TABLE "{TABLE}" ADD CONSTRAINT "{TABLE}_part_id_uniq" UNIQUE (id, created_at)')
+        cursor.execute(
+            f'ALTER TABLE "{TABLE}" ADD CONSTRAINT "{TABLE}_part_rater_fk" FOREIGN KEY (rater_id) '
+            f'REFERENCES "{user_table}" (pkid) DEFERRABLE INITIALLY DEFERRED'
+        )
+        cursor.execute(
+            f'ALTER TABLE "{TABLE}" ADD CONSTRAINT "{TABLE}_part_agent_fk" FOREIGN KEY (agent_id) '
+            f'REFERENCES "{profile_table}" (pkid) DEFERRABLE INITIALLY DEFERRED'
+        )
+        cursor.execute(f'CREATE INDEX "{TABLE}_part_rater_idx" ON "{TABLE}" (rater_id)')
+        cursor.execute(f'DROP INDEX IF EXISTS "rating_agent_recent_idx"')
+        cursor.execute(f'DROP INDEX IF EXISTS "rating_sync_idx"')
+        cursor.execute(f'CREATE INDEX "rating_sync_idx" ON "{TABLE}" (updated_at, pkid)')
+        # Covering: the newest reviews and their scores come straight off the
+        # index of the newest partition.
+        cursor.execute(
+            f'CREATE INDEX "rating_agent_recent_idx" ON "{TABLE}" (agent_id, created_at DESC) '
+            'INCLUDE (rating, rater_id)'
+        )
+
+        cursor.execute(
+            f'CREATE TABLE "{PAIR_TABLE}" ('
+            'rating_id bigint PRIMARY KEY, rater_id bigint, agent_id bigint, UNIQUE (rater_id, agent_id))'
+        )
+        cursor.execute(f'INSERT INTO "{PAIR_TABLE}" SELECT pkid, rater_id, agent_id FROM "{TABLE}"')
+        cursor.execute(
+            f"""
+            CREATE FUNCTION "{PAIR_TRIGGER}"() RETURNS trigger AS $$
+            BEGIN
+                IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                    DELETE FROM "{PAIR_TABLE}" WHERE rating_id = OLD.pkid;
+                END IF;
+                IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                    INSERT INTO "{PAIR_TABLE}" VALUES (NEW.pkid, NEW.rater_id, NEW.agent_id);
+                END IF;
+                RETURN NULL;
+            END
+            $$ LANGUAGE plpgsql
+            """
+        )
+        cursor.execute(
+            f'CREATE TRIGGER "{PAIR_TRIGGER}" AFTER INSERT OR DELETE OR UPDATE OF rater_id, agent_id '
+            f'ON "{TABLE}" FOR EACH ROW EXECUTE FUNCTION "{PAIR_TRIGGER}"()'
+        )
+        cursor.execute(f'ANALYZE "{TABLE}"')
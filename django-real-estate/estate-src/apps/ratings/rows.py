@@ -0,0 +1,42 @@
+from dataclasses import dataclass
+from datetime import datetime
+from uuid import UUID
+
+from apps.common.rows import RowSerializer, format_datetime
+
+# Usernames come from joins, so no User/Profile instances are built.
+RATING_ROW_FIELDS = [
+    'id',
+    'rater__username',
+    'agent__user__username',
+    'created_at',
+    'rating',
+    'comment',
+]
+
+@dataclass(slots=True, frozen=True)
+class RatingRow:
+    id: UUID
+    rater: str
+    agent: str
+    created_at: datetime
+    rating: int
+    comment: str
+
+def rating_rows(queryset):
+    return [RatingRow(*values) for values in queryset.values_list(*RATING_ROW_FIELDS)]
+
+class RatingRowSerializer(RowSerializer):
+    """
+    Same output as RatingSerializer, from RatingRow objects.
+    """
+
+    def to_representation(self, row):
+        return {
+            'rater': row.rater,
+            'agent': row.agent,
+            'id': str(row.id),
+            'created_at': format_datetime(row.created_at),
+            'rating': row.rating,
+            'comment': row.comment,
+        }
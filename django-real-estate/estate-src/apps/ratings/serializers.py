@@ -7,10 +7,10 @@ class RatingSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Rating
-        exclude = ['update_at', 'pkid']
+        exclude = ['updated_at', 'pkid']
 
     def get_rater(self, obj):
-        return obj.rater.username
+        return obj.rater.username if obj.rater else None
     
     def get_agent(self, obj):
-        return obj.agent.user
\ No newline at end of file
+        return obj.agent.user.username if obj.agent else None
\ No newline at end of file
@@ -0,0 +1,20 @@
+from django.db.models.signals import post_delete, pre_delete
+from django.dispatch import receiver
+from django.utils import timezone
+from real_estate.settings.base import AUTH_USER_MODEL
+from apps.common.sync import record_tombstone
+from apps.profiles.models import Profile
+from apps.ratings.models import Rating
+
+post_delete.connect(record_tombstone, sender=Rating, dispatch_uid='rating_tombstone')
+
+# Deleting a rater or an agent nulls the ratings' foreign key with an
+# UPDATE that leaves updated_at alone; bump it first so the change reaches
+# the sync feed.
+@receiver(pre_delete, sender=AUTH_USER_MODEL)
+def touch_rater_ratings(sender, instance, **kwargs):
+    Rating.objects.filter(rater=instance).update(updated_at=timezone.now())
+
+@receiver(pre_delete, sender=Profile)
+def touch_agent_ratings(sender, instance, **kwargs):
+    Rating.objects.filter(agent=instance).update(updated_at=timezone.now())
@@ -0,0 +1,20 @@
+from apps.common.sync import SyncFeed
+from .models import Rating
+from .rows import RATING_ROW_FIELDS, RatingRow, RatingRowSerializer
+
+# The usernames are a snapshot: renaming a user doesn't touch its ratings.
+# Clients join these ids to the profile feed, which carries renames (see
+# apps.profiles.signals.save_user_profile).
+RATING_SYNC_FIELDS = [*RATING_ROW_FIELDS, 'rater__profile__id', 'agent__id']
+
+def serialize_ratings(ratings, context):
+    serializer = RatingRowSerializer(None, context=context)
+    data = []
+    for *values, rater_profile_id, agent_profile_id in ratings.values_list(*RATING_SYNC_FIELDS):
+        representation = serializer.to_representation(RatingRow(*values))
+        representation['rater_profile_id'] = str(rater_profile_id) if rater_profile_id else None
+        representation['agent_profile_id'] = str(agent_profile_id) if agent_profile_id else None
+        data.append(representation)
+    return data
+
+RATING_FEED = SyncFeed(Rating, serialize_ratings)
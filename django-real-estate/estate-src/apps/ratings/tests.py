@@ -1,3 +1,182 @@
+import uuid
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+from io import StringIO
+from unittest import skipUnless
+
+from django.core.management import call_command
+from django.db import IntegrityError, connection, transaction
 from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apps.profiles.tests import create_user
+from . import partitioning
+from .models import Rating
+from .rows import RatingRowSerializer, rating_rows
+from .serializers import RatingSerializer
+
+class RatingConditionalGetTests(TestCase):
+    def setUp(self):
+        self.rater = create_user('rater')
+        self.agent = create_user('agent').profile
+        self.rating = Rating.objects.create(rater=self.rater, agent=self.agent, rating=4, comment='Great')
+        self.client = APIClient()
+        self.client.force_authenticate(self.rater)
+
+    def test_agent_ratings_not_modified(self):
+        url = reverse('agent-ratings', args=[self.agent.id])
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data[0]['agent'], 'agent')
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 304)
+
+    def test_detail_modified_after_save(self):
+        url = reverse('rating-details', args=[self.rating.id])
+        etag = self.client.get(url)['ETag']
+
+        self.rating.rating = 5
+        self.rating.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['rating'], 5)
+
+    def test_modified_after_rater_rename(self):
+        for url in (reverse('rating-details', args=[self.rating.id]), reverse('agent-ratings', args=[self.agent.id])):
+            etag = self.client.get(url)['ETag']
+            self.rater.username = f'{self.rater.username}x'
+            self.rater.save()
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, 200)
+
+class RatingExportTests(TestCase):
+    def setUp(self):
+        self.staff = create_user('staff', is_staff=True)
+        agent = create_user('agent').profile
+        Rating.objects.create(rater=self.staff, agent=agent, rating=3, comment='Good, "solid" work')
+        self.client = APIClient()
+        self.client.force_authenticate(self.staff)
+
+    def test_csv_export_streams(self):
+        response = self.client.get(reverse('rating-export', args=['csv']), HTTP_ACCEPT='text/csv')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual(lines[0], 'id,rater_id,rater,agent_id,agent,rating,comment,created_at,updated_at')
+        self.assertIn('staff', lines[1])
+        self.assertIn('"Good, ""solid"" work"', lines[1])
+
+    def test_export_requires_staff(self):
+        self.client.force_authenticate(create_user('plain'))
+        response = self.client.get(reverse('rating-export', args=['csv']))
+        self.assertEqual(response.status_code, 403)
+
+class RecentRatingsTests(TestCase):
+    def setUp(self):
+        self.agent = create_user('agent').profile
+        self.raters = [create_user(f'rater{i}') for i in range(3)]
+        for i, rater in enumerate(self.raters):
+            Rating.objects.create(rater=rater, agent=self.agent, rating=i + 1, comment='ok')
+        # The first review is older than the recent window.
+        Rating.objects.filter(rater=self.raters[0]).update(created_at=timezone.now() - timedelta(days=400))
+        self.client = APIClient()
+        self.client.force_authenticate(self.raters[0])
+
+    def test_recent_window_then_fallback(self):
+        url = reverse('agent-recent-ratings', args=[self.agent.id])
+        response = self.client.get(url, {'limit': 2})
+        self.assertEqual([row['rater'] for row in response.data], ['rater2', 'rater1'])
+
+        # Not enough reviews inside the window: the unbounded query fills the page.
+        response = self.client.get(url, {'limit': 5})
+        self.assertEqual([row['rater'] for row in response.data], ['rater2', 'rater1', 'rater0'])
+
+    def test_unknown_agent(self):
+        response = self.client.get(reverse('agent-recent-ratings', args=[uuid.uuid4()]))
+        self.assertEqual(response.status_code, 404)
+
+class PartitioningTests(TestCase):
+    def test_month_helpers(self):
+        self.assertEqual(partitioning.add_months(date(2026, 11, 1), 3), date(2027, 2, 1))
+        months = list(partitioning.month_range(date(2026, 11, 15), date(2027, 1, 1)))
+        self.assertEqual(months, [date(2026, 11, 1), date(2026, 12, 1), date(2027, 1, 1)])
+        self.assertEqual(partitioning.partition_name(date(2027, 1, 1)), 'ratings_rating_p202701')
+
+    def test_command_falls_back_without_postgres(self):
+        if partitioning.supports_partitioning(connection):
+            self.skipTest('Fallback only applies to databases without partitioning.')
+        out = StringIO()
+        call_command('partition_ratings', '--convert', stdout=out)
+        self.assertIn('rating_agent_recent_idx', out.getvalue())
+
+@skipUnless(partitioning.supports_partitioning(connection), 'Declarative partitioning needs PostgreSQL.')
+class PostgresPartitioningTests(TestCase):
+    def setUp(self):
+        self.raters = [create_user(f'rater{i}') for i in range(3)]
+        self.agent = create_user('agent').profile
+        self.this_month = timezone.now().date().replace(day=1)
+
+    def rate(self, rater, created_at):
+        rating = Rating.objects.create(rater=rater, agent=self.agent, rating=4, comment='Fine')
+        Rating.objects.filter(pk=rating.pk).update(created_at=created_at)
+        return rating
+
+    def rows_in(self, table):
+        with connection.cursor() as cursor:
+            cursor.execute(f'SELECT pkid FROM "{table}"')
+            return {pkid for pkid, in cursor.fetchall()}
+
+    def test_convert_keeps_rows_and_pair_uniqueness(self):
+        old = self.rate(self.raters[0], datetime(2024, 3, 10, tzinfo=dt_timezone.utc))
+        partitioning.convert_to_partitioned(connection, self.this_month)
+
+        self.assertTrue(partitioning.is_partitioned(connection))
+        self.assertEqual(self.rows_in(partitioning.partition_name(date(2024, 3, 1))), {old.pk})
+        self.assertEqual(Rating.objects.get(pk=old.pk).rater, self.raters[0])
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Rating.objects.create(rater=self.raters[0], agent=self.agent, rating=1, comment='Again')
+
+    def test_raters_and_agents_can_be_deleted_after_convert(self):
+        rating = self.rate(self.raters[0], timezone.now())
+        partitioning.convert_to_partitioned(connection, self.this_month)
+
+        self.raters[0].delete()
+        self.agent.user.delete()
+        with connection.cursor() as cursor:
+            # The foreign keys are deferred; check them now, not at commit.
+            cursor.execute('SET CONSTRAINTS ALL IMMEDIATE')
+        rating = Rating.objects.get(pk=rating.pk)
+        self.assertIsNone(rating.rater_id)
+        self.assertIsNone(rating.agent_id)
+
+    def test_create_partitions_moves_rows_out_of_default(self):
+        partitioning.convert_to_partitioned(connection, self.this_month)
+        # A missed cron run: a month without a partition already has rows.
+        month = partitioning.add_months(self.this_month, 2)
+        start = datetime(month.year, month.month, 3, tzinfo=dt_timezone.utc)
+        stray = self.rate(self.raters[1], start)
+        self.assertEqual(self.rows_in(partitioning.DEFAULT_PARTITION), {stray.pk})
+
+        created, failed = partitioning.create_partitions(connection, self.this_month, month)
+        self.assertIn(partitioning.partition_name(month), created)
+        self.assertEqual(failed, {})
+        self.assertEqual(self.rows_in(partitioning.DEFAULT_PARTITION), set())
+        self.assertEqual(self.rows_in(partitioning.partition_name(month)), {stray.pk})
+        # The pair table followed the move.
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Rating.objects.create(rater=self.raters[1], agent=self.agent, rating=1, comment='Again')
+        self.assertEqual(partitioning.create_partitions(connection, self.this_month, month), ([], {}))
+
+class RatingRowSerializerTests(TestCase):
+    def test_matches_rating_serializer(self):
+        agent = create_user('agent').profile
+        Rating.objects.create(rater=create_user('rater'), agent=agent, rating=5, comment='Top')
+        Rating.objects.create(rater=None, agent=agent, rating=2, comment='Anonymous')
 
-# Create your tests here.
+        ratings = Rating.objects.order_by('pkid')
+        expected = RatingSerializer(ratings.select_related('rater', 'agent__user'), many=True).data
+        actual = RatingRowSerializer(rating_rows(ratings), many=True).data
+        self.assertEqual(actual, [dict(row) for row in expected])
+        self.assertEqual(list(actual[0]), list(expected[0]))
@@ -0,0 +1,13 @@
+from django.urls import path
+from .views import (
+    RatingDetailAPIView, RatingExportAPIView, RatingListAPIView, RatingSyncAPIView, RecentAgentRatingsAPIView,
+)
+
+urlpatterns = [
+    path('all/', RatingListAPIView.as_view(), name='all-ratings'),
+    path('agent/<uuid:agent_id>/', RatingListAPIView.as_view(), name='agent-ratings'),
+    path('agent/<uuid:agent_id>/recent/', RecentAgentRatingsAPIView.as_view(), name='agent-recent-ratings'),
+    path('sync/', RatingSyncAPIView.as_view(), name='rating-sync'),
+    path('<uuid:id>/', RatingDetailAPIView.as_view(), name='rating-details'),
+    path('export/<str:export_format>/', RatingExportAPIView.as_view(), name='rating-export'),
+]
@@ -1,3 +1,60 @@
-from django.shortcuts import render
+from django.shortcuts import get_object_or_404
+from rest_framework import generics, permissions
+from rest_framework.response import Response
+from rest_framework.views import APIView
 
-# Create your views here.
+from apps.common.conditional import ConditionalGetMixin
+from apps.common.rows import RowListMixin
+from apps.common.views import ExportAPIView, SyncAPIView
+from apps.profiles.models import Profile
+from .exports import RATING_EXPORT
+from .models import Rating
+from .rows import RatingRowSerializer, rating_rows
+from .serializers import RatingSerializer
+from .sync import RATING_FEED
+
+# RatingSerializer renders the rater's and the agent's usernames; their
+# profiles' updated_at covers them (see apps.profiles.signals.save_user_profile).
+RATING_VALIDATOR_FIELDS = ('updated_at', 'agent__updated_at', 'rater__profile__updated_at')
+
+class RatingListAPIView(ConditionalGetMixin, RowListMixin, generics.ListAPIView):
+    permission_classes = [permissions.IsAuthenticated]
+    serializer_class = RatingSerializer
+    row_serializer_class = RatingRowSerializer
+    validator_fields = RATING_VALIDATOR_FIELDS
+
+    def get_rows(self, queryset):
+        return rating_rows(queryset)
+
+    def get_queryset(self):
+        queryset = Rating.objects.select_related('rater', 'agent__user').order_by('-created_at')
+        agent_id = self.kwargs.get('agent_id')
+        if agent_id is not None:
+            queryset = queryset.filter(agent__id=agent_id)
+        return queryset
+
+class RecentAgentRatingsAPIView(APIView):
+    permission_classes = [permissions.IsAuthenticated]
+    max_limit = 50
+
+    def get(self, request, agent_id):
+        agent = get_object_or_404(Profile.objects.only('pkid'), id=agent_id)
+        try:
+            limit = min(max(int(request.query_params.get('limit', 10)), 1), self.max_limit)
+        except ValueError:
+            limit = 10
+        ratings = Rating.objects.select_related('rater', 'agent__user').recent_for_agent(agent, limit)
+        return Response(RatingSerializer(ratings, many=True).data)
+
+class RatingDetailAPIView(ConditionalGetMixin, generics.RetrieveAPIView):
+    permission_classes = [permissions.IsAuthenticated]
+    serializer_class = RatingSerializer
+    queryset = Rating.objects.select_related('rater', 'agent__user')
+    lookup_field = 'id'
+    validator_fields = RATING_VALIDATOR_FIELDS
+
+class RatingExportAPIView(ExportAPIView):
+    export = RATING_EXPORT
+
+class RatingSyncAPIView(SyncAPIView):
+    feed = RATING_FEED
@@ -6,4 +6,5 @@ class UsersConfig(AppConfig):
     name = 'apps.users'
 
     def ready(self):
-        from apps.profiles import signals
\ No newline at end of file
+        from apps.profiles import signals
+        from apps.users import signals
@@ -0,0 +1,64 @@
+"""
+Public user cards by UUID for the batch endpoint, through a per-user cache.
+
+Cards are cached as UserCard values under the user's pkid, so the signals in
+apps.users.signals can drop them on any user or profile save without a
+query. User and profile UUIDs resolve to that pkid through alias entries;
+those mappings never change, so aliases are never invalidated. A read
+racing with a write can still cache the old card; the timeout bounds how
+long it is served.
+"""
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db.models import Q
+
+from .rows import USER_CARD_FIELDS, UserCard
+
+User = get_user_model()
+
+CARD_KEY = 'user_card:{}'
+ALIAS_KEY = 'user_card_id:{}'
+ALIAS_TIMEOUT = 24 * 60 * 60
+
+
+def card_timeout():
+    return settings.USER_CARD_CACHE_SECONDS
+
+
+def forget_user_card(user_pk):
+    cache.delete(CARD_KEY.format(user_pk))
+
+
+def get_user_cards(ids):
+    """
+    Map each UUID in ``ids``, a user's or a profile's, to that user's
+    UserCard, or to None if there is no such user. Cache misses are
+    resolved with one ``id__in`` query joined to the profile.
+    """
+    ids = list(dict.fromkeys(ids))
+    aliases = cache.get_many([ALIAS_KEY.format(id) for id in ids])
+    user_pks = {id: aliases[ALIAS_KEY.format(id)] for id in ids if ALIAS_KEY.format(id) in aliases}
+    cached = cache.get_many([CARD_KEY.format(pk) for pk in set(user_pks.values())])
+    found = {}
+    for id, pk in user_pks.items():
+        values = cached.get(CARD_KEY.format(pk))
+        if values is not None:
+            found[id] = UserCard(*values)
+
+    missing = [id for id in ids if id not in found]
+    if missing:
+        queryset = User.objects.filter(Q(id__in=missing) | Q(profile__id__in=missing))
+        new_cards, new_aliases = {}, {}
+        for *values, pk, profile_id in queryset.values_list(*USER_CARD_FIELDS, 'pkid', 'profile__id'):
+            card = UserCard(*values)
+            new_cards[CARD_KEY.format(pk)] = tuple(values)
+            found[card.id] = card
+            new_aliases[ALIAS_KEY.format(card.id)] = pk
+            if profile_id is not None:
+                found[profile_id] = card
+                new_aliases[ALIAS_KEY.format(profile_id)] = pk
+        cache.set_many(new_cards, card_timeout())
+        # Aliases never go stale; the timeout only bounds the cache size.
+        cache.set_many(new_aliases, ALIAS_TIMEOUT)
+    return {id: found.get(id) for id in ids}
@@ -0,0 +1,108 @@
+from dataclasses import dataclass
+from uuid import UUID
+
+from apps.common.rows import RowSerializer, file_url
+
+# Just the columns UserSerializer renders: no password hash, no about_me.
+USER_ROW_FIELDS = [
+    'id',
+    'username',
+    'email',
+    'first_name',
+    'last_name',
+    'is_superuser',
+    'profile__gender',
+    'profile__phone_number',
+    'profile__profile_photo',
+    'profile__country',
+    'profile__city',
+    'profile__top_agent',
+]
+
+@dataclass(slots=True, frozen=True)
+class UserRow:
+    id: UUID
+    username: str
+    email: str
+    first_name: str
+    last_name: str
+    is_superuser: bool
+    gender: str
+    phone_number: object
+    profile_photo: str
+    country: str
+    city: str
+    top_agent: bool
+
+# What any user may see of another on rating lists and cards: no email,
+# phone number or admin flags.
+USER_CARD_FIELDS = [
+    'id',
+    'username',
+    'first_name',
+    'last_name',
+    'profile__profile_photo',
+    'profile__country',
+    'profile__city',
+    'profile__top_agent',
+]
+
+@dataclass(slots=True, frozen=True)
+class UserCard:
+    id: UUID
+    username: str
+    first_name: str
+    last_name: str
+    profile_photo: str
+    country: str
+    city: str
+    top_agent: bool
+
+def user_rows(queryset):
+    return [UserRow(*values) for values in queryset.values_list(*USER_ROW_FIELDS)]
+
+class UserRowSerializer(RowSerializer):
+    """
+    Same output as UserSerializer, from UserRow objects.
+    """
+
+    def to_representation(self, row):
+        first_name = row.first_name.title()
+        last_name = row.last_name.title()
+        representation = {
+            'id': str(row.id),
+            'username': row.username,
+            'email': row.email,
+            'first_name': first_name,
+            'last_name': last_name,
+            'full_name': f"{first_name} {last_name}",
+            'gender': row.gender,
+            'phone_number': str(row.phone_number),
+            'profile_photo': file_url(row.profile_photo, self.context.get('request')),
+            'country': row.country,
+            'city': row.city,
+            'top_seller': row.top_agent,
+        }
+        if row.is_superuser:
+            representation['admin'] = True
+        return representation
+
+class UserCardSerializer(RowSerializer):
+    """
+    The public subset of UserSerializer's output, from UserCard objects.
+    """
+
+    def to_representation(self, card):
+        first_name = card.first_name.title()
+        last_name = card.last_name.title()
+        return {
+            'id': str(card.id),
+            'username': card.username,
+            'first_name': first_name,
+            'last_name': last_name,
+            'full_name': f"{first_name} {last_name}",
+            'profile_photo': file_url(card.profile_photo, self.context.get('request')),
+            'country': card.country,
+            'city': card.city,
+            'top_seller': card.top_agent,
+        }
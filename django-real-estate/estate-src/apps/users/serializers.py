@@ -4,15 +4,17 @@ from djoser.serializers import UserCreateSerializer
 from phonenumber_field.serializerfields import PhoneNumberField
 from rest_framework import serializers
 
+from apps.common.compiled import CompiledSerializerMixin
+
 User = get_user_model()
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(CompiledSerializerMixin, serializers.ModelSerializer):
     gender = serializers.CharField(source='profile.gender')
     phone_number = PhoneNumberField(source='profile.phone_number')
     profile_photo = serializers.ImageField(source='profile.profile_photo')
     country = CountryField(source='profile.country')
     city = serializers.CharField(source='profile.city')
-    top_seller = serializers.BooleanField(source='profile.top_seller')
+    top_seller = serializers.BooleanField(source='profile.top_agent')
     first_name = serializers.SerializerMethodField()
     last_name = serializers.SerializerMethodField()
     full_name = serializers.SerializerMethodField(source='get_full_name')
@@ -39,6 +41,9 @@ class UserSerializer(serializers.ModelSerializer):
     
     def get_last_name(self, obj):
         return obj.last_name.title()
+
+    def get_full_name(self, obj):
+        return obj.get_full_name
     
     def to_representation(self,  instance):
         representation = super(UserSerializer, self).to_representation(instance)
@@ -48,6 +53,11 @@ class UserSerializer(serializers.ModelSerializer):
 
         return representation
     
+class DRFUserSerializer(UserSerializer):
+    # UserSerializer without the compiled fast path: the baseline it is
+    # checked and benchmarked against.
+    compiled_representation = False
+
 class CreateUserSerializer(UserCreateSerializer):
     class Meta(UserCreateSerializer.Meta):
         model = User
@@ -0,0 +1,15 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from apps.profiles.models import Profile
+from apps.users.cards import forget_user_card
+
+User = get_user_model()
+
+@receiver([post_save, post_delete], sender=User)
+def forget_card_for_user(sender, instance, **kwargs):
+    forget_user_card(instance.pk)
+
+@receiver([post_save, post_delete], sender=Profile)
+def forget_card_for_profile(sender, instance, **kwargs):
+    forget_user_card(instance.user_id)
@@ -0,0 +1,140 @@
+import uuid
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient, APIRequestFactory
+
+from apps.common.compiled import compiled_source
+from apps.profiles.models import Profile
+from apps.profiles.tests import create_user
+from .rows import UserRowSerializer, user_rows
+from .serializers import DRFUserSerializer, UserSerializer
+
+User = get_user_model()
+
+class UserRowSerializerTests(TestCase):
+    def setUp(self):
+        create_user('maria')
+        admin = create_user('root', is_superuser=True, is_staff=True)
+        admin.profile.profile_photo = 'house_sample.jpg'
+        admin.profile.save()
+
+    def test_matches_user_serializer(self):
+        context = {'request': APIRequestFactory().get('/')}
+        users = User.objects.order_by('pkid')
+        expected = UserSerializer(users.select_related('profile'), many=True, context=context).data
+        actual = UserRowSerializer(user_rows(users), many=True, context=context).data
+        self.assertEqual(actual, [dict(row) for row in expected])
+        self.assertEqual(list(actual[1]), list(expected[1]))
+        self.assertTrue(actual[1]['admin'])
+
+    def test_list_endpoint_is_one_query(self):
+        client = APIClient()
+        client.force_authenticate(User.objects.get(username='root'))
+        with self.assertNumQueries(1):
+            response = client.get(reverse('all-users'))
+        self.assertEqual([row['username'] for row in response.data], ['maria', 'root'])
+        self.assertNotIn('password', response.data[0])
+
+
+class CompiledUserSerializerTests(TestCase):
+    def setUp(self):
+        self.user = create_user('maria')
+        User.objects.filter(pk=self.user.pk).update(first_name='maria', last_name='silva')
+        self.user.profile.city = 'Lisbon'
+        self.user.profile.phone_number = '+351912345678'
+        self.user.profile.country = 'PT'
+        self.user.profile.top_agent = True
+        self.user.profile.save()
+        admin = create_user('root', is_superuser=True, is_staff=True)
+        admin.profile.profile_photo = 'house_sample.jpg'
+        admin.profile.save()
+
+    def assertSameOutput(self, compiled, drf):
+        self.assertEqual(compiled, drf)
+        self.assertEqual(list(compiled), list(drf))
+
+    def test_single_object(self):
+        user = User.objects.select_related('profile').get(username='maria')
+        data = UserSerializer(user).data
+        self.assertSameOutput(data, DRFUserSerializer(user).data)
+        self.assertEqual(data['full_name'], 'Maria Silva')
+        self.assertTrue(data['top_seller'])
+        self.assertTrue(compiled_source(UserSerializer))
+
+    def test_list_with_request_context(self):
+        context = {'request': APIRequestFactory().get('/')}
+        users = User.objects.select_related('profile').order_by('pkid')
+        data = UserSerializer(users, many=True, context=context).data
+        self.assertSameOutput(data, DRFUserSerializer(users, many=True, context=context).data)
+        self.assertTrue(data[1]['admin'])
+        self.assertTrue(data[1]['profile_photo'].startswith('http://testserver/'))
+
+    def test_missing_profile_falls_back_to_drf(self):
+        Profile.objects.filter(user=self.user).delete()
+        user = User.objects.get(pk=self.user.pk)
+        # DRF renders the profile fields as None; the compiled function
+        # hits RelatedObjectDoesNotExist and hands over to it.
+        data = UserSerializer(user).data
+        self.assertSameOutput(data, DRFUserSerializer(user).data)
+        self.assertIsNone(data['city'])
+
+    def test_unexpected_errors_are_raised(self):
+        user = User.objects.select_related('profile').get(username='maria')
+        with mock.patch.object(UserSerializer, 'get_first_name', side_effect=ValueError('boom')):
+            with self.assertRaisesMessage(ValueError, 'boom'):
+                UserSerializer(user).data
+
+
+class UserBatchTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.maria = create_user('maria')
+        self.root = create_user('root', is_superuser=True, is_staff=True)
+        self.client = APIClient()
+        self.client.force_authenticate(self.maria)
+
+    def batch(self, *ids):
+        response = self.client.get(reverse('user-batch'), {'ids': ','.join(str(id) for id in ids)})
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_one_query_then_cached(self):
+        unknown = uuid.uuid4()
+        ids = [self.maria.id, self.root.profile.id, unknown]
+        with self.assertNumQueries(1):
+            data = self.batch(*ids)
+        self.assertEqual(list(data), [str(id) for id in ids])
+        self.assertEqual(data[str(self.maria.id)]['username'], 'maria')
+        self.assertEqual(data[str(self.root.profile.id)]['id'], str(self.root.id))
+        self.assertIsNone(data[str(unknown)])
+
+        # Cached, whether asked for by user or by profile id.
+        with self.assertNumQueries(0):
+            cached = self.batch(self.maria.id, self.root.profile.id, self.root.id)
+        self.assertEqual(cached[str(self.root.id)], data[str(self.root.profile.id)])
+
+    def test_cards_are_public_fields_only(self):
+        card = self.batch(self.root.id)[str(self.root.id)]
+        context = {'request': APIRequestFactory().get('/')}
+        full = UserSerializer(User.objects.get(pk=self.root.pk), context=context).data
+        self.assertEqual(card, {key: value for key, value in full.items() if key in card})
+        for private in ('email', 'phone_number', 'gender', 'admin'):
+            self.assertNotIn(private, card)
+
+    def test_profile_change_invalidates_card(self):
+        self.batch(self.maria.profile.id)
+        profile = Profile.objects.get(pk=self.maria.profile.pk)
+        profile.city = 'Recife'
+        profile.save()
+        self.assertEqual(self.batch(self.maria.profile.id)[str(self.maria.profile.id)]['city'], 'Recife')
+
+    def test_invalid_ids(self):
+        url = reverse('user-batch')
+        self.assertEqual(self.client.get(url).status_code, 400)
+        self.assertEqual(self.client.get(url, {'ids': 'not-a-uuid'}).status_code, 400)
+        too_many = ','.join(str(uuid.uuid4()) for _ in range(101))
+        self.assertEqual(self.client.get(url, {'ids': too_many}).status_code, 400)
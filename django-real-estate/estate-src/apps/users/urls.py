@@ -0,0 +1,7 @@
+from django.urls import path
+from .views import UserBatchAPIView, UserListAPIView
+
+urlpatterns = [
+    path('all/', UserListAPIView.as_view(), name='all-users'),
+    path('batch/', UserBatchAPIView.as_view(), name='user-batch'),
+]
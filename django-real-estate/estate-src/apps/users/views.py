@@ -1,3 +1,49 @@
-from django.shortcuts import render
+import uuid
 
-# Create your views here.
+from django.contrib.auth import get_user_model
+from rest_framework import generics, permissions
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from apps.common.rows import RowListMixin
+from .cards import get_user_cards
+from .rows import UserCardSerializer, UserRowSerializer, user_rows
+from .serializers import UserSerializer
+
+User = get_user_model()
+
+class UserListAPIView(RowListMixin, generics.ListAPIView):
+    permission_classes = [permissions.IsAdminUser]
+    serializer_class = UserSerializer
+    row_serializer_class = UserRowSerializer
+    queryset = User.objects.order_by('pkid')
+
+    def get_rows(self, queryset):
+        return user_rows(queryset)
+
+class UserBatchAPIView(APIView):
+    """
+    ``GET ?ids=<uuid>,<uuid>,...``: up to ``max_ids`` public user cards
+    (see UserCardSerializer) keyed by the requested UUIDs, each a user's or
+    a profile's id; unknown ids map to null.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    max_ids = 100
+
+    def get(self, request):
+        raw_ids = [value.strip() for value in request.query_params.get('ids', '').split(',') if value.strip()]
+        if not raw_ids:
+            raise ValidationError({'ids': 'Expected a comma-separated list of UUIDs.'})
+        if len(raw_ids) > self.max_ids:
+            raise ValidationError({'ids': f'At most {self.max_ids} ids per request.'})
+        try:
+            ids = [uuid.UUID(value) for value in raw_ids]
+        except ValueError:
+            raise ValidationError({'ids': 'Expected a comma-separated list of UUIDs.'})
+
+        serializer = UserCardSerializer(None, context={'request': request})
+        return Response({
+            str(id): serializer.to_representation(card) if card is not None else None
+            for id, card in get_user_cards(ids).items()
+        })
@@ -81,13 +81,26 @@ INSTALLED_APPS = DJANGO_APPS + THIRD_PARTY_APPS + LOCAL_APPS
 # Middleware definitions: a list of middleware components that process requests/responses.
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
-    'django.contrib.sessions.middleware.SessionMiddleware',
+    'apps.common.middleware.ReplicaPinMiddleware',  # Read-your-writes for the replica router.
     'django.middleware.common.CommonMiddleware',  # Provides various HTTP conveniences.
+    'apps.common.middleware.PathDispatchMiddleware',  # Runs FULL_STACK_MIDDLEWARE outside the API.
+    'django.middleware.clickjacking.XFrameOptionsMiddleware',
+]
+
+# Session/cookie based middleware, run by PathDispatchMiddleware for the admin
+# (and everything else outside LEAN_MIDDLEWARE_PATHS). The API authenticates
+# with JWT only, so it skips them.
+FULL_STACK_MIDDLEWARE = [
+    'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',  # Cross Site Request Forgery protection.
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
-    'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
+LEAN_MIDDLEWARE_PATHS = ['/api/']
+
+# The admin and deploy checks look for these middleware in MIDDLEWARE; they are in
+# FULL_STACK_MIDDLEWARE instead, which /supersecret/ goes through.
+SILENCED_SYSTEM_CHECKS = ['admin.E408', 'admin.E409', 'admin.E410', 'security.W003']
 
 # Root URL configuration module for the project.
 ROOT_URLCONF = 'real_estate.urls'
@@ -117,6 +130,14 @@ WSGI_APPLICATION = 'real_estate.wsgi.application'
 # For more information, refer to:
 # https://docs.djangoproject.com/en/5.1/ref/settings/#databases
 
+# Reads of these apps go to the aliases in DATABASE_REPLICAS (set per environment).
+DATABASE_ROUTERS = ['apps.common.routers.ReplicaRouter']
+DATABASE_REPLICAS = []
+REPLICA_ROUTED_APPS = ['profiles', 'ratings']
+REPLICA_PIN_SECONDS = 10           # Reads stay on the primary this long after a client writes.
+REPLICA_HEALTH_CHECK_SECONDS = 5   # How often a healthy replica is re-probed.
+REPLICA_EJECT_SECONDS = 30         # How long a failing replica is skipped.
+
 
 # Password validation configuration: a list of validators to enforce password policies.
 AUTH_PASSWORD_VALIDATORS = [
@@ -161,6 +182,25 @@ STATICFILES_DIR = []
 MEDIA_URL = '/mediafiles/'
 MEDIA_ROOT = BASE_DIR / 'mediafiles'
 
+# Profile photo uploads (apps.profiles.photos) stream to a temporary file and
+# are rejected past MAX_UPLOAD_SIZE; photos over REENCODE_BYTES or SIZE px are
+# downsized by the process_profile_photos worker.
+PROFILE_PHOTO_MAX_UPLOAD_SIZE = 10 * 2 ** 20
+PROFILE_PHOTO_MAX_PIXELS = 50_000_000
+PROFILE_PHOTO_SIZE = 1600
+PROFILE_PHOTO_REENCODE_BYTES = 2 ** 20
+
+# Delta-sync feeds (apps.common.sync). Changes are served SYNC_LAG_SECONDS
+# after they are saved, so slow transactions still commit before clients
+# move past them; tombstones are kept for SYNC_TOMBSTONE_DAYS.
+SYNC_PAGE_SIZE = 500
+SYNC_LAG_SECONDS = 5
+SYNC_TOMBSTONE_DAYS = 30
+
+# Per-user cache of the cards served by api/v1/users/batch/ (apps.users.cards),
+# in the default cache.
+USER_CARD_CACHE_SECONDS = 300
+
 # Default primary key field type for models.
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
@@ -170,7 +210,32 @@ AUTH_USER_MODEL = 'users.User'
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
         'rest_framework_simplejwt.authentication.JWTAuthentication',
-    )
+    ),
+    # JSON through orjson when it is installed (see apps.common.jsonlib).
+    "DEFAULT_RENDERER_CLASSES": (
+        'apps.common.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    "DEFAULT_PARSER_CLASSES": (
+        'apps.common.parsers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ),
+    # Sliding-window limits on the djoser/JWT endpoints, per client IP and per
+    # login email. Counters live in the default cache, so every worker must
+    # share it (e.g. Redis) for the limits to be global.
+    "DEFAULT_THROTTLE_CLASSES": (
+        'apps.common.throttles.AuthIPRateThrottle',
+        'apps.common.throttles.AuthAccountRateThrottle',
+    ),
+    "DEFAULT_THROTTLE_RATES": {
+        'auth_ip': '30/min',
+        'auth_account': '5/min',
+    },
+    # Reverse proxies in front of the app. Client IPs are read from that many
+    # hops back in X-Forwarded-For; with 0 only REMOTE_ADDR is trusted, since
+    # clients can send any X-Forwarded-For they like.
+    "NUM_PROXIES": env.int('NUM_PROXIES', default=0),
 }
 
 from datetime import timedelta
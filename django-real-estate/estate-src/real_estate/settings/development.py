@@ -19,3 +19,11 @@ DATABASES = {
         'PORT' : env('POSTGRES_PORT'),
     }
 }
+
+# Optional read replicas: a space-separated list of hosts that share the
+# primary's database name and credentials. Tests read them through the primary.
+DATABASE_REPLICAS = []
+for index, host in enumerate(env('POSTGRES_REPLICA_HOSTS', default='').split()):
+    alias = f'replica_{index}'
+    DATABASES[alias] = {**DATABASES['default'], 'HOST': host, 'TEST': {'MIRROR': 'default'}}
+    DATABASE_REPLICAS.append(alias)
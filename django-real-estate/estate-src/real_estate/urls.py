@@ -10,6 +10,10 @@ urlpatterns = [
     path('supersecret/', admin.site.urls),
     path('api/v1/auth', include('djoser.urls')),
     path('api/v1/auth', include('djoser.urls.jwt')),
+    path('api/v1/common/', include('apps.common.urls')),
+    path('api/v1/users/', include('apps.users.urls')),
+    path('api/v1/profiles/', include('apps.profiles.urls')),
+    path('api/v1/ratings/', include('apps.ratings.urls')),
 ]
 
 # Append media file serving configuration for development: